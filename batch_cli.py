@@ -0,0 +1,355 @@
+"""一括処理のコマンドライン版
+
+GUIなしで BatchProcessor のリサイズ・反転と ImageCropper の一括切り取りを実行する。
+
+使い方:
+    python batch_cli.py resize <フォルダ> [--mode CROP|FIT] [--size AUTO|幅x高さ] [--align CENTER]
+                                         [--bg #RRGGBB | --transparent]
+    python batch_cli.py flip <フォルダ>
+    python batch_cli.py crop-recipe <フォルダ> --recipe <CropSpecのJSON>
+    python batch_cli.py index <フォルダ> [--workers N]
+
+    共通オプション: --workers N, --recursive, --out <出力フォルダ>, --dry-run, --force, --use-index
+
+index で作ったメタデータ索引があれば、--use-index でフォルダを走査せずに索引から処理対象を決める。
+
+完了した画像は出力フォルダのマニフェストに記録し、再実行時は同じ設定で処理済みの画像をスキップする。
+処理に失敗した画像があった場合は終了コード1を返す。
+"""
+import argparse
+import concurrent.futures
+import itertools
+import json
+import os
+import sys
+import time
+
+from crop_engine import (
+    AlignMode, CropSpec, ResizeSpec, parse_hex_color, parse_output_size,
+    resize_file, flip_file, crop_file, OutputManifest, settings_digest, run_with_fingerprint
+)
+from image_index import ImageIndex, INDEX_FILENAME
+
+
+# 処理対象の拡張子（GUIと同じ）
+RESIZE_FORMATS = {'.jpg', '.jpeg', '.png', '.webp'}
+CROP_FORMATS = {'.png', '.jpg', '.jpeg', '.webp', '.bmp', '.gif', '.tiff'}
+
+# 出力フォルダの既定名（GUIと同じく入力フォルダの中に作る）
+DEFAULT_OUTPUT_NAMES = {
+    'resize': "resize",
+    'flip': "flipped",
+    'crop-recipe': "batch_cropped"
+}
+
+
+def build_parser():
+    """コマンドライン引数の定義"""
+    parser = argparse.ArgumentParser(description="画像の一括処理（GUIなし）")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('input_folder', help="処理するフォルダ")
+    common.add_argument('--workers', type=int, default=None,
+                        help="ワーカープロセス数（省略時はCPUコア数）")
+    common.add_argument('--recursive', action='store_true', help="サブフォルダも処理する")
+    common.add_argument('--out', default=None,
+                        help="出力フォルダ（省略時は入力フォルダ内の resize / flipped / batch_cropped）")
+    common.add_argument('--dry-run', action='store_true', help="処理内容を表示するだけで実行しない")
+    common.add_argument('--force', action='store_true', help="処理済みの画像もすべて処理し直す")
+    common.add_argument('--use-index', action='store_true',
+                        help="フォルダを走査せず、index で作った索引から処理対象を決める")
+
+    resize_parser = subparsers.add_parser('resize', parents=[common], help="一番近い解像度にリサイズ")
+    resize_parser.add_argument('--mode', choices=["CROP", "FIT"], default="CROP",
+                               help="CROP: トリミング / FIT: フィット（既定: CROP）")
+    resize_parser.add_argument('--size', default="AUTO",
+                               help="出力サイズ（AUTO または 幅x高さ、既定: AUTO）")
+    resize_parser.add_argument('--align', choices=[mode.name for mode in AlignMode], default="CENTER",
+                               help="トリミング・配置の位置（既定: CENTER）")
+    resize_parser.add_argument('--bg', default="#FFFFFF", help="フィット時の背景色（既定: #FFFFFF）")
+    resize_parser.add_argument('--transparent', action='store_true', help="透明背景を使用")
+
+    subparsers.add_parser('flip', parents=[common], help="奇数番目の画像を左右反転")
+
+    crop_parser = subparsers.add_parser('crop-recipe', parents=[common],
+                                        help="CropSpecのJSONで一括切り取り")
+    crop_parser.add_argument('--recipe', required=True, help="切り取り設定（CropSpec）のJSONファイル")
+
+    index_parser = subparsers.add_parser('index', help="メタデータ索引を作成・差分更新")
+    index_parser.add_argument('input_folder', help="データセットのルートフォルダ")
+    index_parser.add_argument('--workers', type=int, default=None,
+                              help="ヘッダを読むワーカープロセス数（省略時はCPUコア数）")
+    return parser
+
+
+def build_job(args):
+    """引数から (ワーカー関数, 設定, 対象の拡張子) を作成（設定が不正な場合はValueError）"""
+    if args.command == 'resize':
+        spec = ResizeSpec(
+            output_size=parse_output_size(args.size),
+            resize_mode=args.mode,
+            align_mode=AlignMode[args.align],
+            use_transparent=args.transparent,
+            bg_color=(0, 0, 0) if args.transparent else parse_hex_color(args.bg)
+        )
+        return resize_file, spec, RESIZE_FORMATS
+    if args.command == 'flip':
+        return flip_file, None, RESIZE_FORMATS
+
+    with open(args.recipe, encoding='utf-8') as f:
+        spec = CropSpec.from_dict(json.load(f))
+    return crop_file, spec, CROP_FORMATS
+
+
+def output_folders(input_folder, output_folder):
+    """再帰処理で辿らない出力フォルダ（指定の出力先と、入力フォルダ直下の既定の出力フォルダすべて）"""
+    folders = {os.path.abspath(os.path.join(input_folder, name)) for name in DEFAULT_OUTPUT_NAMES.values()}
+    folders.add(os.path.abspath(output_folder))
+    return folders
+
+
+def iter_folders(input_folder, output_folder, recursive):
+    """処理するフォルダを順に返す（出力フォルダと隠しフォルダの中は処理しない）
+
+    ImageIndex の索引と同じフォルダを辿る。
+    """
+    if not recursive:
+        yield input_folder
+        return
+    exclude_folders = output_folders(input_folder, output_folder)
+    for folder, subfolders, _ in os.walk(input_folder):
+        subfolders[:] = sorted(
+            name for name in subfolders
+            if not name.startswith('.') and os.path.abspath(os.path.join(folder, name)) not in exclude_folders
+        )
+        yield folder
+
+
+def iter_tasks(args, input_folder, output_folder, supported_formats):
+    """(入力パス, 出力パス) を順に返す（フォルダは1つずつ読む）"""
+    for folder in iter_folders(input_folder, output_folder, args.recursive):
+        with os.scandir(folder) as entries:
+            names = sorted(entry.name for entry in entries
+                           if entry.is_file() and os.path.splitext(entry.name)[1].lower() in supported_formats)
+        if args.command == 'flip':
+            # GUIと同じく名前順で奇数番目だけを反転し、ファイル名はそのまま
+            names = names[::2]
+
+        target_folder = os.path.normpath(os.path.join(output_folder, os.path.relpath(folder, input_folder)))
+        for name in names:
+            output_name = name if args.command == 'flip' else os.path.splitext(name)[0] + ".png"
+            yield os.path.join(folder, name), os.path.join(target_folder, output_name), None
+
+
+def iter_index_tasks(args, index, input_folder, output_folder, supported_formats):
+    """iter_tasks と同じ内容を索引から返す
+
+    フォルダは走査せず、各入力の stat だけを取る。サイズと更新日時が索引と一致する場合のみ
+    索引の内容を入力の指紋として添え、マニフェストとの比較でハッシュの計算を省く。
+    """
+    exclude_folders = []
+    for folder in output_folders(input_folder, output_folder):
+        # 入力フォルダの外（Windowsでは別のドライブを含む）の出力フォルダは索引に含まれない
+        try:
+            if os.path.commonpath([folder, input_folder]) != input_folder:
+                continue
+        except ValueError:
+            continue  # 別のドライブ
+        exclude_folders.append(os.path.relpath(folder, input_folder).replace(os.sep, '/'))
+    records = index.query(recursive=args.recursive, supported_formats=supported_formats,
+                          exclude_folders=exclude_folders)
+    for folder, folder_records in itertools.groupby(records, key=lambda record: record.folder):
+        folder_records = list(folder_records)
+        if args.command == 'flip':
+            folder_records = folder_records[::2]
+
+        target_folder = os.path.normpath(os.path.join(output_folder, *folder.split('/')))
+        for record in folder_records:
+            input_path = os.path.join(input_folder, *record.path.split('/'))
+            name = os.path.basename(record.path)
+            output_name = name if args.command == 'flip' else os.path.splitext(name)[0] + ".png"
+            # 索引の後で変更された入力や読めなかった画像は、指紋を使わずにファイルで確認する
+            try:
+                stat = os.stat(input_path)
+            except FileNotFoundError:
+                continue  # 索引の後で削除された
+            fingerprint = None
+            if record.content_hash and (stat.st_size, stat.st_mtime_ns) == (record.size, record.mtime_ns):
+                fingerprint = (record.size, record.mtime_ns, record.content_hash)
+            yield input_path, os.path.join(target_folder, output_name), fingerprint
+
+
+def format_progress_bar(done, total, failed, start_time, width=30):
+    """テキストのプログレスバーを作成"""
+    filled = min(width, int(width * done / total)) if total else width
+    text = f"[{'#' * filled}{'-' * (width - filled)}] {done}/{total}"
+    if failed:
+        text += f" 失敗 {failed}"
+    elapsed = time.perf_counter() - start_time
+    if done and elapsed > 0:
+        rate = done / elapsed
+        minutes, seconds = divmod(int(max(0, total - done) / rate), 60)
+        text += f"  {rate:.1f} 枚/秒  残り約 {minutes}:{seconds:02d}"
+    return text
+
+
+def check_tasks(tasks, manifest, force):
+    """(入力パス, 出力パス, 処理済みか) を順に返す（一覧は保持しない）"""
+    for input_path, output_path, fingerprint in tasks:
+        up_to_date = not force and manifest.is_up_to_date(input_path, output_path, fingerprint)
+        yield input_path, output_path, up_to_date
+
+
+def run_tasks(worker, spec, tasks, total, manifest, max_workers):
+    """プロセスプールで処理して完了した画像をマニフェストに記録し、失敗した件数を返す
+
+    Args:
+        tasks: (入力パス, 出力パス) を順に返すイテレータ
+        total: 進捗表示用の件数
+    """
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_in_flight = max_workers * 2  # 一覧全体を投入せず、この数だけ先に投入しておく
+    done = 0
+    failed = 0
+    start_time = time.perf_counter()
+    last_draw = 0.0
+    created_folders = set()
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+        in_flight = {}
+        try:
+            while True:
+                while len(in_flight) < max_in_flight:
+                    task = next(tasks, None)
+                    if task is None:
+                        break
+                    input_path, output_path = task
+                    output_dir = os.path.dirname(output_path)
+                    if output_dir not in created_folders:
+                        os.makedirs(output_dir, exist_ok=True)
+                        created_folders.add(output_dir)
+                    args = (input_path, output_path) if spec is None else (input_path, output_path, spec)
+                    in_flight[executor.submit(run_with_fingerprint, worker, *args)] = (input_path, output_path)
+                if not in_flight:
+                    break
+
+                finished, _ = concurrent.futures.wait(in_flight, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in finished:
+                    input_path, output_path = in_flight.pop(future)
+                    done += 1
+                    try:
+                        result, stat, content_hash = future.result()
+                        if result is False:
+                            # crop_file は切り取り範囲が小さすぎる画像をスキップする
+                            failed += 1
+                        else:
+                            manifest.record(input_path, output_path, stat, content_hash)
+                    except Exception as e:
+                        failed += 1
+                        print(f"\nError processing {input_path}: {e}", file=sys.stderr)
+
+                # 進捗表示は10Hzまで
+                now = time.perf_counter()
+                if now - last_draw >= 0.1 or done == total:
+                    last_draw = now
+                    print("\r" + format_progress_bar(done, total, failed, start_time), end="", file=sys.stderr)
+        except KeyboardInterrupt:
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+    print(file=sys.stderr)
+    return failed
+
+
+def refresh_index(input_folder, max_workers):
+    """索引を差分更新する（一括処理の既定の出力フォルダは索引に含めない）"""
+    start_time = time.perf_counter()
+    last_draw = 0.0
+
+    def show_progress(done, total):
+        # 進捗表示は10Hzまで
+        nonlocal last_draw
+        now = time.perf_counter()
+        if now - last_draw >= 0.1 or done == total:
+            last_draw = now
+            print("\r" + format_progress_bar(done, total, 0, start_time), end="", file=sys.stderr)
+
+    exclude_folders = [os.path.join(input_folder, name) for name in DEFAULT_OUTPUT_NAMES.values()]
+    with ImageIndex(input_folder) as index:
+        updated, removed, unchanged = index.refresh(max_workers, exclude_folders, show_progress)
+    if updated:
+        print(file=sys.stderr)
+    print(f"索引を更新しました: 追加・更新 {updated}件  削除 {removed}件  変更なし {unchanged}件", file=sys.stderr)
+    return 0
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    input_folder = os.path.abspath(args.input_folder)
+    if not os.path.isdir(input_folder):
+        parser.error(f"フォルダが存在しません: {args.input_folder}")
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers は1以上を指定してください")
+    if args.command == 'index':
+        return refresh_index(input_folder, args.workers)
+    if args.use_index and not os.path.exists(os.path.join(input_folder, INDEX_FILENAME)):
+        parser.error(f"索引がありません。先に index を実行してください: {args.input_folder}")
+    try:
+        worker, spec, supported_formats = build_job(args)
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        parser.error(f"設定が正しくありません: {e}")
+
+    output_folder = os.path.abspath(args.out or os.path.join(input_folder, DEFAULT_OUTPUT_NAMES[args.command]))
+
+    # dry-run ではマニフェストに書き込まない
+    manifest = OutputManifest(input_folder, output_folder, settings_digest(args.command, spec),
+                              read_only=args.dry_run)
+    index = ImageIndex(input_folder) if args.use_index else None
+
+    def iter_checked_tasks():
+        if index is not None:
+            tasks = iter_index_tasks(args, index, input_folder, output_folder, supported_formats)
+        else:
+            tasks = iter_tasks(args, input_folder, output_folder, supported_formats)
+        return check_tasks(tasks, manifest, args.force)
+
+    try:
+        # 一覧は保持せず、1回目で件数だけを数えて2回目で順に処理する（_resize_folder と同じ）
+        total = 0
+        skipped = 0
+        for input_path, output_path, up_to_date in iter_checked_tasks():
+            if up_to_date:
+                skipped += 1
+                continue
+            total += 1
+            if args.dry_run:
+                print(f"{input_path} -> {output_path}")
+        if args.dry_run:
+            print(f"{total} 件  処理済み: {skipped}件（dry-run のため処理していません）", file=sys.stderr)
+            return 0
+        if not total:
+            print(f"処理対象の画像がありません。（処理済み: {skipped}件）", file=sys.stderr)
+            return 0
+
+        pending = ((input_path, output_path)
+                   for input_path, output_path, up_to_date in iter_checked_tasks() if not up_to_date)
+        try:
+            failed = run_tasks(worker, spec, pending, total, manifest, args.workers)
+        except KeyboardInterrupt:
+            print("\n処理が中止されました。（完了した分は次回スキップされます）", file=sys.stderr)
+            return 130
+    finally:
+        manifest.close()
+        if index is not None:
+            index.close()
+
+    print(f"処理完了: {total - failed}件  失敗: {failed}件  処理済み: {skipped}件  保存先: {output_folder}",
+          file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,51 +1,213 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, colorchooser, messagebox
 import os
-from PIL import Image, ImageOps
-from enum import Enum, auto
+from PIL import Image
 import concurrent.futures
 import threading
+import queue
+import time
+import json
+import platform
+from contextlib import contextmanager
+from crop_engine import (
+    TARGET_RESOLUTIONS, AlignMode, ResizeSpec, parse_hex_color, parse_output_size,
+    resize_file, flip_file, OutputManifest, settings_digest, run_with_fingerprint
+)
+
+
+def default_worker_count():
+    """並列処理のワーカー数の既定値（このプロセスが使えるCPUコア数）"""
+    if hasattr(os, 'sched_getaffinity'):
+        return max(1, len(os.sched_getaffinity(0)))
+    return os.cpu_count() or 1
+
+def iter_image_files(folder, supported_formats):
+    """フォルダ内の画像ファイル名を順に返す（一覧をメモリに保持しない）"""
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            if entry.is_file() and os.path.splitext(entry.name)[1].lower() in supported_formats:
+                yield entry.name
+
+def default_memory_limit():
+    """一括処理で同時にデコードする画像のメモリ上限の既定値（物理メモリの半分）"""
+    try:
+        return os.sysconf('SC_PHYS_PAGES') * os.sysconf('SC_PAGE_SIZE') // 2
+    except (AttributeError, ValueError, OSError):
+        # sysconf が使えない環境（Windowsなど）
+        return 2 * 1024 * 1024 * 1024
+
+class MemoryBudget:
+    """実行中のタスクの推定メモリ量の合計が上限を超えないよう開始を待たせる
+
+    小さな画像は上限内でワーカー数だけ同時に動き、大きな画像は空きが出るまで待つ。
+    上限を超える1枚は他のタスクがなくなってから単独で実行する。
+    """
+
+    def __init__(self, limit_bytes):
+        self.limit_bytes = limit_bytes
+        self.used_bytes = 0
+        self.condition = threading.Condition()
+        # 到着順に番号を発行し、大きな画像が小さな画像に追い越され続けないようにする
+        self.next_ticket = 0
+        self.serving_ticket = 0  # 次に開始できる番号
+        self.abandoned_tickets = set()  # 中止で待機をやめた番号
+
+    def acquire(self, nbytes, check_stop=None):
+        """nbytes分の空きができるまで待ってから確保する"""
+        with self.condition:
+            ticket = self.next_ticket
+            self.next_ticket += 1
+            try:
+                while (ticket != self.serving_ticket or
+                       (self.used_bytes and self.used_bytes + nbytes > self.limit_bytes)):
+                    if check_stop:
+                        check_stop()
+                    self.condition.wait(0.1)
+            except BaseException:
+                self.abandoned_tickets.add(ticket)
+                self._advance_ticket()
+                raise
+            self.used_bytes += nbytes
+            self.serving_ticket += 1
+            self._advance_ticket()
+
+    def _advance_ticket(self):
+        """待機をやめた番号を飛ばして待機中のスレッドを起こす（condition保持中に呼ぶ）"""
+        while self.serving_ticket in self.abandoned_tickets:
+            self.abandoned_tickets.discard(self.serving_ticket)
+            self.serving_ticket += 1
+        self.condition.notify_all()
+
+    def release(self, nbytes):
+        """確保した分を返す"""
+        with self.condition:
+            self.used_bytes -= nbytes
+            self.condition.notify_all()
+
+    @contextmanager
+    def reserve(self, nbytes, check_stop=None):
+        """with文の間だけnbytes分を確保する"""
+        self.acquire(nbytes, check_stop)
+        try:
+            yield
+        finally:
+            self.release(nbytes)
+
+class ProcessCancelled(Exception):
+    """処理の中止が要求された"""
+
+AUTOTUNE_PROFILE_PATH = os.path.join(os.path.expanduser("~"), ".image_cropper", "autotune.json")
+
+def load_autotune_profile(profile_key):
+    """前回の自動調整で選ばれたワーカー数を読み込む（記録がなければNone）"""
+    try:
+        with open(AUTOTUNE_PROFILE_PATH, encoding='utf-8') as f:
+            return json.load(f).get(profile_key, {}).get('workers')
+    except (OSError, ValueError):
+        return None
+
+def save_autotune_profile(profile_key, workers, images_per_sec):
+    """自動調整で選ばれたワーカー数を記録する"""
+    try:
+        with open(AUTOTUNE_PROFILE_PATH, encoding='utf-8') as f:
+            profiles = json.load(f)
+    except (OSError, ValueError):
+        profiles = {}
+    profiles[profile_key] = {
+        'workers': workers,
+        'images_per_sec': round(images_per_sec, 2),
+        'updated': time.strftime('%Y-%m-%d %H:%M:%S')
+    }
+    try:
+        os.makedirs(os.path.dirname(AUTOTUNE_PROFILE_PATH), exist_ok=True)
+        with open(AUTOTUNE_PROFILE_PATH, 'w', encoding='utf-8') as f:
+            json.dump(profiles, f, ensure_ascii=False, indent=2)
+    except OSError as e:
+        print(f"自動調整の記録に失敗しました: {e}")
+
+class WorkerAutotuner:
+    """処理速度を測りながら同時実行数を調整する（山登り法）
+
+    一定時間ごとに枚数/秒とCPU使用率（process_time / 経過時間）を測り、
+    速くなる方向へ並列数を動かす。速くならなければ最良の値に戻して刻みを半分にし、
+    刻みが0になったら収束とみなす。CPUが飽和している間はコア数より増やさない。
+    """
+
+    def __init__(self, initial_workers, max_workers, sample_seconds=2.0):
+        self.cpu_count = default_worker_count()
+        self.max_workers = max_workers
+        self.workers = max(1, min(initial_workers, max_workers))
+        self.step = max(1, self.workers // 2)
+        self.direction = 1
+        self.best_workers = self.workers
+        self.best_rate = 0.0
+        self.converged = False
+        self.sample_seconds = sample_seconds  # 1回の測定に使う最短時間
+        self._start_sample()
+
+    def _start_sample(self):
+        self.sample_start = time.perf_counter()
+        self.sample_cpu = time.process_time()
+        self.sample_done = 0
+
+    def get_max_in_flight(self):
+        """投入しておくタスク数（待ち行列を作らず、並列数そのもの）"""
+        return self.workers
+
+    def task_done(self):
+        """タスク1件の完了を記録し、測定区間が終わったら並列数を調整する"""
+        self.sample_done += 1
+        elapsed = time.perf_counter() - self.sample_start
+        # 短すぎる区間や件数の少ない区間では速度が安定しない
+        if elapsed < self.sample_seconds or self.sample_done < self.workers * 2:
+            return
+        images_per_sec = self.sample_done / elapsed
+        cpu_usage = (time.process_time() - self.sample_cpu) / elapsed / self.cpu_count
+        if not self.converged:
+            self._adjust(images_per_sec, cpu_usage)
+        self._start_sample()
+
+    def _adjust(self, images_per_sec, cpu_usage):
+        if images_per_sec > self.best_rate * 1.05:
+            self.best_rate = images_per_sec
+            self.best_workers = self.workers
+        else:
+            # 速くならなかったので最良の値に戻り、逆方向へ小さく動かす
+            self.workers = self.best_workers
+            self.direction = -self.direction
+            self.step //= 2
+            if self.step == 0:
+                self.converged = True
+                return
 
-
-# 定数定義
-TARGET_RESOLUTIONS = {
-    "1024:1024": [(1024, 1024)],
-    "832/1216": [
-        (1216, 832),   # 横長モード
-        (832, 1216)    # 縦長モード
-    ],
-    "768/1344": [
-        (1344, 768),   # 横長モード
-        (768, 1344)    # 縦長モード
-    ],
-    "896/1152": [
-        (1152, 896),   # 横長モード
-        (896, 1152)    # 縦長モード
-    ]
-}
-
-class AlignMode(Enum):
-    TOP_LEFT = auto()
-    TOP_CENTER = auto()
-    TOP_RIGHT = auto()
-    CENTER_LEFT = auto()
-    CENTER = auto()
-    CENTER_RIGHT = auto()
-    BOTTOM_LEFT = auto()
-    BOTTOM_CENTER = auto()
-    BOTTOM_RIGHT = auto()
+        # CPUが飽和していればI/O待ちは少なく、コア数を超えて増やしても速くならない
+        upper = self.max_workers if cpu_usage < 0.85 else min(self.max_workers, self.cpu_count)
+        self.workers = max(1, min(upper, self.workers + self.direction * self.step))
 
 class ProcessStatus:
     def __init__(self):
         self.is_running = False
         self.should_stop = False
 
+    def check_stop(self):
+        """中止が要求されていれば ProcessCancelled を送出（処理の段階の間で呼ぶ）"""
+        if self.should_stop:
+            raise ProcessCancelled()
+
 class BatchProcessor:
-    def __init__(self, image_cropper=None):
+    def __init__(self, image_cropper=None, max_workers=None, memory_limit=None):
         self.process_status = ProcessStatus()
         self.image_cropper = image_cropper
         self.root = None
-        self.pil_lock = threading.Lock()  # ロック追加
+        self.max_workers = max_workers  # ワーカー数の初期値（Noneの場合はCPUコア数から自動設定）
+        self.tasks_per_worker = 2  # ワーカー1つあたりの投入済みタスク数の上限
+        self.memory_limit = memory_limit  # 同時に処理する画像の推定メモリ量の上限（Noneの場合は物理メモリの半分）
+        self.progress_interval_ms = 100  # 進捗表示の更新間隔（10Hz）
+        self.autotune_max_workers = max(8, default_worker_count() * 4)  # 自動調整で試す並列数の上限
+        self.autotuner = None  # 実行中の自動調整（WorkerAutotuner）
+        self.autotune_profile_key = None  # 自動調整の記録のキー（マシン名|フォルダ|処理）
+        self.progress_queue = queue.Queue()  # バックグラウンドスレッドからの進捗通知
+        self.start_time = None
 
 
     def setup_gui(self):
@@ -79,6 +241,15 @@ class BatchProcessor:
                                     values=size_options, state="readonly", width=15)
         size_dropdown.grid(row=2, column=1, sticky=tk.W, padx=5)
 
+        # 並列数選択
+        worker_frame = ttk.Frame(main_frame)
+        worker_frame.grid(row=2, column=2, sticky=tk.W)
+        ttk.Label(worker_frame, text="並列数:").grid(row=0, column=0, sticky=tk.W)
+        self.worker_count = tk.StringVar(value=str(self.max_workers) if self.max_workers else "AUTO")
+        worker_options = ["AUTO", "自動調整"] + [str(n) for n in range(1, default_worker_count() * 2 + 1)]
+        ttk.Combobox(worker_frame, textvariable=self.worker_count, values=worker_options,
+                    state="readonly", width=6).grid(row=0, column=1, padx=5)
+
         # 背景色設定
         bg_frame = ttk.Frame(main_frame)
         bg_frame.grid(row=3, column=0, columnspan=3, sticky=tk.W, pady=5)
@@ -151,6 +322,60 @@ class BatchProcessor:
 
 
 
+    def get_worker_count(self):
+        """並列処理のワーカー数を取得（自動調整の場合はNone）"""
+        worker_count = self.worker_count.get()
+        if worker_count == "AUTO":
+            return default_worker_count()
+        if worker_count == "自動調整":
+            return None
+        return int(worker_count)
+
+    def create_autotuner(self, input_folder, task_name):
+        """前回の記録（マシン・フォルダ・処理ごと）から自動調整を開始"""
+        profile_key = f"{platform.node()}|{os.path.abspath(input_folder)}|{task_name}"
+        initial_workers = load_autotune_profile(profile_key) or default_worker_count()
+        self.autotune_profile_key = profile_key
+        self.autotuner = WorkerAutotuner(initial_workers, self.autotune_max_workers)
+        return self.autotuner
+
+    def finish_autotuner(self):
+        """自動調整の結果を次回のために記録"""
+        tuner = self.autotuner
+        self.autotuner = None
+        if tuner is not None and tuner.best_rate > 0:
+            save_autotune_profile(self.autotune_profile_key, tuner.best_workers, tuner.best_rate)
+
+    def get_memory_limit(self):
+        """同時に処理する画像の推定メモリ量の上限を取得"""
+        return self.memory_limit or default_memory_limit()
+
+    def submit_bounded(self, executor, tasks, max_in_flight):
+        """タスクを最大 max_in_flight 件ずつ投入し、完了したFutureを順に返す
+
+        Args:
+            executor: 実行に使うExecutor
+            tasks: (関数, 引数...) を順に返すイテラブル（必要になった分だけ読み進める）
+            max_in_flight: 同時に投入しておくタスク数の上限（実行中に変わる場合は値を返す関数）
+
+        中止フラグが立った後は新しいタスクを投入しない。
+        """
+        tasks = iter(tasks)
+        in_flight = set()
+        while True:
+            limit = max_in_flight() if callable(max_in_flight) else max_in_flight
+            while len(in_flight) < limit and not self.process_status.should_stop:
+                task = next(tasks, None)
+                if task is None:
+                    break
+                in_flight.add(executor.submit(*task))
+
+            if not in_flight:
+                return
+            done, in_flight = concurrent.futures.wait(
+                in_flight, return_when=concurrent.futures.FIRST_COMPLETED)
+            yield from done
+
     # def find_best_resolution(self, width, height):
     #     """最適な解像度を見つける"""
     #     original_ratio = width / height
@@ -168,67 +393,11 @@ class BatchProcessor:
 
     #     return best_resolution
         
-    def calculate_paste_position(self, align_mode, target_size, resized_size):
-        """アライメントモードに基づいて貼り付け位置を計算"""
-        target_w, target_h = target_size
-        resized_w, resized_h = resized_size
-        
-        # 水平位置の計算
-        if align_mode in [AlignMode.TOP_LEFT, AlignMode.CENTER_LEFT, AlignMode.BOTTOM_LEFT]:
-            paste_x = 0
-        elif align_mode in [AlignMode.TOP_RIGHT, AlignMode.CENTER_RIGHT, AlignMode.BOTTOM_RIGHT]:
-            paste_x = target_w - resized_w
-        else:  # CENTER
-            paste_x = (target_w - resized_w) // 2
-
-        # 垂直位置の計算
-        if align_mode in [AlignMode.TOP_LEFT, AlignMode.TOP_CENTER, AlignMode.TOP_RIGHT]:
-            paste_y = 0
-        elif align_mode in [AlignMode.BOTTOM_LEFT, AlignMode.BOTTOM_CENTER, AlignMode.BOTTOM_RIGHT]:
-            paste_y = target_h - resized_h
-        else:  # CENTER
-            paste_y = (target_h - resized_h) // 2
-
-        return paste_x, paste_y
-
-    def calculate_crop_box(self, img_size, target_size, align_mode):
-        """アライメントモードに基づいて切り取り範囲を計算"""
-        img_width, img_height = img_size
-        target_width, target_height = target_size
-        
-        ratio = max(target_width / img_width, target_height / img_height)
-        new_width = int(img_width * ratio)
-        new_height = int(img_height * ratio)
-        
-        if align_mode in [AlignMode.TOP_LEFT, AlignMode.TOP_CENTER, AlignMode.TOP_RIGHT]:
-            y = 0
-        elif align_mode in [AlignMode.CENTER_LEFT, AlignMode.CENTER, AlignMode.CENTER_RIGHT]:
-            y = (new_height - target_height) // 2
-        else:
-            y = new_height - target_height
-
-        if align_mode in [AlignMode.TOP_LEFT, AlignMode.CENTER_LEFT, AlignMode.BOTTOM_LEFT]:
-            x = 0
-        elif align_mode in [AlignMode.TOP_CENTER, AlignMode.CENTER, AlignMode.BOTTOM_CENTER]:
-            x = (new_width - target_width) // 2
-        else:
-            x = new_width - target_width
-
-        return (x, y, x + target_width, y + target_height), (new_width, new_height)
-
-
     def flip_image(self, input_path, output_path):
         """画像の反転処理"""
         try:
-            with Image.open(input_path) as img:
-                if img.mode in ('RGBA', 'LA') or (img.mode == 'P' and 'transparency' in img.info):
-                    img = img.convert('RGBA')
-                else:
-                    img = img.convert('RGB')
-                
-                flipped_img = ImageOps.mirror(img)
-                flipped_img.save(output_path, format='PNG', optimize=True)
-                return True
+            flip_file(input_path, output_path)
+            return True
         except Exception as e:
             print(f"Error processing {input_path}: {e}")
             return False
@@ -236,12 +405,12 @@ class BatchProcessor:
     def run_resize_processing(self):
         """
         画像の一括リサイズ処理を実行する
-        - マルチスレッドで並列処理
+        - 別スレッドで並列処理を管理し、GUIを止めない
         - 進捗状況の表示
         - 中断機能
         """
         print("処理開始")
-        # GUIからの設定値を取得（スレッドセーフな処理のため先に取得）
+        # GUIからの設定値を取得（ワーカースレッドからTkの変数に触れないよう先に取得）
         output_size = self.output_size.get()
         print(f"Selected output size: {output_size}")
         
@@ -252,160 +421,123 @@ class BatchProcessor:
         if not self.validate_folder(input_folder):
             return
 
-        # 処理状態を初期化
-        self.process_status.is_running = True
-        self.process_status.should_stop = False
-        self.update_button_states()
-
+        use_transparent = self.use_transparent.get()
         try:
-            # 出力フォルダの作成
-            output_folder = os.path.join(input_folder, "resize")
-            os.makedirs(output_folder, exist_ok=True)
-
-            # 処理対象ファイルの収集
-            supported_formats = {'.jpg', '.jpeg', '.png', '.webp'}
-            files_to_process = [f for f in os.listdir(input_folder) 
-                            if os.path.splitext(f)[1].lower() in supported_formats]
-            
-            if not files_to_process:
-                self.status_var.set("処理対象の画像がありません。")
-                return
-
-            # GUI設定値の取得
-            align_mode = self.align_mode.get()
-            use_transparent = self.use_transparent.get()
-            resize_mode = self.resize_mode.get()
-            bg_color = self.bg_color.get()
-
-            total_files = len(files_to_process)
-            processed_files = 0
-            futures = []
-
-            def process_image(input_path, output_path, output_size):
-                """
-                個別画像の処理
-                Args:
-                    input_path: 入力画像パス
-                    output_path: 出力画像パス
-                    output_size: 出力サイズ設定（"AUTO"または"幅x高さ"形式）
-                """
-                print(f"Processing with size: {output_size}")
+            bg_color = (0, 0, 0) if use_transparent else parse_hex_color(self.bg_color.get())
+        except ValueError:
+            self.status_var.set("背景色の指定が正しくありません。")
+            return
+        spec = ResizeSpec(
+            output_size=parse_output_size(output_size),
+            resize_mode=self.resize_mode.get(),
+            align_mode=AlignMode[self.align_mode.get()],
+            use_transparent=use_transparent,
+            bg_color=bg_color
+        )
+        self.start_background_task(self._resize_folder, input_folder, spec, self.get_worker_count())
+
+    def _resize_folder(self, input_folder, spec, worker_count):
+        """フォルダ内の画像をリサイズ（バックグラウンドスレッドで実行）
+
+        Returns:
+            処理結果のメッセージ
+        """
+        # 出力フォルダの作成
+        output_folder = os.path.join(input_folder, "resize")
+        os.makedirs(output_folder, exist_ok=True)
+
+        # 前回までに同じ設定で処理済みの画像を除き、未処理・失敗・変更された画像だけを処理する
+        supported_formats = {'.jpg', '.jpeg', '.png', '.webp'}
+        manifest = OutputManifest(input_folder, output_folder, settings_digest("resize", spec))
+
+        # 一覧は保持せず件数だけを数え、処理時に一覧を読み直して同じ判定をする
+        # （2回目の判定では、1回目に記録を更新した入力のハッシュは計算し直さない）
+        def iter_pending_tasks():
+            """(入力パス, 出力パス, 処理済みか) を順に返す"""
+            for filename in iter_image_files(input_folder, supported_formats):
+                input_path = os.path.join(input_folder, filename)
+                output_path = os.path.join(output_folder, os.path.splitext(filename)[0] + ".png")
+                yield input_path, output_path, manifest.is_up_to_date(input_path, output_path)
+
+        total_files = 0
+        skipped_files = 0
+        for _, _, up_to_date in iter_pending_tasks():
+            if self.process_status.should_stop:
+                manifest.close()
+                return "処理が中止されました。"
+            if up_to_date:
+                skipped_files += 1
+            else:
+                total_files += 1
+
+        if not total_files:
+            manifest.close()
+            if skipped_files:
+                return f"すべての画像（{skipped_files}件）は処理済みです。"
+            return "処理対象の画像がありません。"
+
+        processed_files = 0
+        processed_bytes = 0
+        memory_budget = MemoryBudget(self.get_memory_limit())
+
+        def process_image(input_path, output_path):
+            """個別画像の処理（成功時は入力ファイルのバイト数、失敗時はFalse）"""
+            try:
+                # デコード前にピーク時のメモリ量を見積もり、上限内に収まるまで待つ
+                input_bytes, stat, content_hash = run_with_fingerprint(
+                    resize_file, input_path, output_path, spec, self.process_status.check_stop,
+                    lambda nbytes: memory_budget.reserve(nbytes, self.process_status.check_stop)
+                )
+                manifest.record(input_path, output_path, stat, content_hash)
+                return input_bytes
+            except ProcessCancelled:
+                return False
+            except Exception as e:
+                print(f"Error processing {input_path}: {e}")
+                return False
+
+        # 並列処理の実行（デコード・リサイズ・PNG圧縮の間はPillowがGILを解放する）
+        Image.init()  # 画像形式プラグインの登録をワーカー起動前に済ませておく
+        if worker_count is None:
+            # 自動調整：スレッドは上限まで用意し、実際の並列数は投入数で制御する
+            tuner = self.create_autotuner(input_folder, "resize")
+            max_workers, max_in_flight = tuner.max_workers, tuner.get_max_in_flight
+        else:
+            tuner = None
+            max_workers, max_in_flight = worker_count, worker_count * self.tasks_per_worker
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            tasks = (
+                (process_image, input_path, output_path)
+                for input_path, output_path, up_to_date in iter_pending_tasks() if not up_to_date
+            )
+
+            # 結果の取得と進捗通知
+            for future in self.submit_bounded(executor, tasks, max_in_flight):
+                if tuner:
+                    tuner.task_done()
                 if self.process_status.should_stop:
-                    return False
+                    # 未着手のタスクは取り消し、実行中のタスクは次の段階の境目で抜ける
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    break
+                
                 try:
-                    with self.pil_lock:  # 画像処理をスレッドセーフに
-                        with Image.open(input_path) as img:
-                            # 画像モードの設定
-                            has_alpha = 'A' in img.getbands() or 'transparency' in img.info
-                            if use_transparent and has_alpha:
-                                img = img.convert('RGBA')
-                            elif use_transparent:
-                                img = img.convert('RGBA')
-                            else:
-                                img = img.convert('RGB')
-
-                            # 出力サイズの決定
-                            if output_size == "AUTO":
-                                # 自動計算モード
-                                original_ratio = img.size[0] / img.size[1]
-                                best_score = float('inf')
-                                best_resolution = None
-
-                                for resolutions in TARGET_RESOLUTIONS.values():
-                                    for target_width, target_height in resolutions:
-                                        target_ratio = target_width / target_height
-                                        score = abs(original_ratio - target_ratio)
-                                        if score < best_score:
-                                            best_score = score
-                                            best_resolution = (target_width, target_height)
-                            else:
-                                # 手動サイズ指定モード
-                                w, h = map(int, output_size.split('x'))
-                                best_resolution = (w, h)
-                            
-                            # リサイズ処理
-                            if resize_mode == "CROP":
-                                # トリミングモード
-                                crop_box, resize_size = self.calculate_crop_box(
-                                    img.size, best_resolution, AlignMode[align_mode])
-                                resized_img = img.resize(resize_size, Image.Resampling.LANCZOS)
-                                final_img = resized_img.crop(crop_box)
-                            else:
-                                # フィットモード
-                                ratio = min(best_resolution[0] / img.size[0], best_resolution[1] / img.size[1])
-                                new_size = (int(img.size[0] * ratio), int(img.size[1] * ratio))
-                                resized_img = img.resize(new_size, Image.Resampling.LANCZOS)
-
-                                # 背景画像の作成
-                                if use_transparent:
-                                    final_img = Image.new('RGBA', best_resolution, (0, 0, 0, 0))
-                                else:
-                                    bg_color_rgb = tuple(int(bg_color[i:i+2], 16) for i in (1, 3, 5))
-                                    final_img = Image.new('RGB', best_resolution, bg_color_rgb)
-
-                                # リサイズ画像の配置
-                                paste_x, paste_y = self.calculate_paste_position(
-                                    AlignMode[align_mode], 
-                                    best_resolution, 
-                                    new_size
-                                )
-                                final_img.paste(resized_img, (paste_x, paste_y))
-
-                            # 画像の保存
-                            final_img.save(output_path, format='PNG', 
-                                        optimize=not use_transparent)
-                    return True
+                    input_bytes = future.result()
+                    if input_bytes is not False:
+                        processed_files += 1
+                        processed_bytes += input_bytes
+                        self.report_progress(processed_files, total_files, processed_bytes)
                 except Exception as e:
-                    print(f"Error processing {input_path}: {e}")
-                    return False
-
-            # 並列処理の実行
-            with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
-                futures = [
-                    executor.submit(
-                        process_image,
-                        os.path.join(input_folder, filename),
-                        os.path.join(output_folder, os.path.splitext(filename)[0] + ".png"),
-                        output_size
-                    ) for filename in files_to_process
-                ]
-
-                # 結果の取得と進捗更新
-                for future in concurrent.futures.as_completed(futures):
-                    if self.process_status.should_stop:
-                        executor.shutdown(wait=False)
-                        break
-                    
-                    try:
-                        success = future.result()
-                        if success:
-                            processed_files += 1
-                            progress = (processed_files / total_files) * 100
-                            self.progress_var.set(progress)
-                            self.status_var.set(f"処理中... {processed_files}/{total_files}")
-                    except Exception as e:
-                        print(f"エラー発生: {e}")
-                        continue
-                    
-                    self.root.update()
-
-                # 処理結果の表示
-                if self.process_status.should_stop:
-                    self.status_var.set("処理が中止されました。")
-                else:
-                    self.status_var.set("リサイズ処理が完了しました。")
+                    print(f"エラー発生: {e}")
+                    continue
+        manifest.close()
+
+        # 処理結果
+        if self.process_status.should_stop:
+            return "処理が中止されました。"
+        if skipped_files:
+            return f"リサイズ処理が完了しました。（処理済みの{skipped_files}件はスキップしました）"
+        return "リサイズ処理が完了しました。"
 
-        except Exception as e:
-            self.status_var.set(f"エラーが発生しました: {str(e)}")
-        finally:
-            # 状態のクリーンアップ
-            self.process_status.is_running = False
-            self.process_status.should_stop = False
-            self.update_button_states()
-            self.root.update()
-            
-    
-    
     def run_flip_processing(self):
         """反転処理の実行（並列処理版）"""
         if self.process_status.is_running:
@@ -415,83 +547,156 @@ class BatchProcessor:
         if not self.validate_folder(input_folder):
             return
 
-        self.process_status.is_running = True
-        self.process_status.should_stop = False
-        self.update_button_states()
-
-        try:
-            output_folder = os.path.join(input_folder, "flipped")
-            os.makedirs(output_folder, exist_ok=True)
+        self.start_background_task(self._flip_folder, input_folder, self.get_worker_count())
 
-            supported_formats = {'.jpg', '.jpeg', '.png', '.webp'}
-            files = sorted([f for f in os.listdir(input_folder) 
-                        if os.path.splitext(f)[1].lower() in supported_formats])
-            
-            odd_numbered_files = files[::2]
-            
-            if not odd_numbered_files:
-                self.status_var.set("処理対象の画像がありません。")
-                return
+    def _flip_folder(self, input_folder, worker_count):
+        """フォルダ内の奇数番目の画像を左右反転（バックグラウンドスレッドで実行）
 
-            total_files = len(odd_numbered_files)
-            processed_files = 0
+        Returns:
+            処理結果のメッセージ
+        """
+        output_folder = os.path.join(input_folder, "flipped")
+        os.makedirs(output_folder, exist_ok=True)
 
-            def process_flip(input_path, output_path):
+        supported_formats = {'.jpg', '.jpeg', '.png', '.webp'}
+        # 奇数番目を選ぶため名前順に並べる必要があり、ファイル名の一覧だけは保持する
+        files = sorted(iter_image_files(input_folder, supported_formats))
+        
+        odd_numbered_files = files[::2]
+        
+        if not odd_numbered_files:
+            return "処理対象の画像がありません。"
+
+        total_files = len(odd_numbered_files)
+        processed_files = 0
+        processed_bytes = 0
+        memory_budget = MemoryBudget(self.get_memory_limit())
+
+        def process_flip(input_path, output_path):
+            """個別画像の反転（成功時は入力ファイルのバイト数、失敗時はFalse）"""
+            try:
+                # デコード前にピーク時のメモリ量を見積もり、上限内に収まるまで待つ
+                return flip_file(
+                    input_path, output_path, self.process_status.check_stop,
+                    lambda nbytes: memory_budget.reserve(nbytes, self.process_status.check_stop)
+                )
+            except ProcessCancelled:
+                return False
+            except Exception as e:
+                print(f"Error processing {input_path}: {e}")
+                return False
+
+        Image.init()  # 画像形式プラグインの登録をワーカー起動前に済ませておく
+        if worker_count is None:
+            # 自動調整：スレッドは上限まで用意し、実際の並列数は投入数で制御する
+            tuner = self.create_autotuner(input_folder, "flip")
+            max_workers, max_in_flight = tuner.max_workers, tuner.get_max_in_flight
+        else:
+            tuner = None
+            max_workers, max_in_flight = worker_count, worker_count * self.tasks_per_worker
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            tasks = (
+                (
+                    process_flip,
+                    os.path.join(input_folder, filename),
+                    os.path.join(output_folder, filename)
+                ) for filename in odd_numbered_files
+            )
+
+            for future in self.submit_bounded(executor, tasks, max_in_flight):
+                if tuner:
+                    tuner.task_done()
                 if self.process_status.should_stop:
-                    return False
+                    # 未着手のタスクは取り消し、実行中のタスクは次の段階の境目で抜ける
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    break
+                
                 try:
-                    with self.pil_lock:
-                        with Image.open(input_path) as img:
-                            if img.mode in ('RGBA', 'LA') or (img.mode == 'P' and 'transparency' in img.info):
-                                img = img.convert('RGBA')
-                            else:
-                                img = img.convert('RGB')
-                            
-                            flipped_img = ImageOps.mirror(img)
-                            flipped_img.save(output_path, format='PNG', optimize=True)
-                    return True
+                    input_bytes = future.result()
+                    if input_bytes is not False:
+                        processed_files += 1
+                        processed_bytes += input_bytes
+                        self.report_progress(processed_files, total_files, processed_bytes)
                 except Exception as e:
-                    print(f"Error processing {input_path}: {e}")
-                    return False
-
-            with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
-                futures = [
-                    executor.submit(
-                        process_flip,
-                        os.path.join(input_folder, filename),
-                        os.path.join(output_folder, filename)
-                    ) for filename in odd_numbered_files
-                ]
-
-                for future in concurrent.futures.as_completed(futures):
-                    if self.process_status.should_stop:
-                        executor.shutdown(wait=False)
-                        break
-                    
-                    try:
-                        if future.result():
-                            processed_files += 1
-                            progress = (processed_files / total_files) * 100
-                            self.progress_var.set(progress)
-                            self.status_var.set(f"処理中... {processed_files}/{total_files}")
-                    except Exception as e:
-                        print(f"エラー発生: {e}")
-                        continue
-                    
-                    self.root.update()
+                    print(f"エラー発生: {e}")
+                    continue
 
-                if self.process_status.should_stop:
-                    self.status_var.set("処理が中止されました。")
-                else:
-                    self.status_var.set("反転処理が完了しました。")
+        if self.process_status.should_stop:
+            return "処理が中止されました。"
+        return "反転処理が完了しました。"
+
+    def start_background_task(self, target, *args):
+        """一括処理を別スレッドで開始し、進捗の定期反映を始める"""
+        # 処理状態を初期化
+        self.process_status.is_running = True
+        self.process_status.should_stop = False
+        self.update_button_states()
+        self.progress_var.set(0)
+        self.status_var.set("処理を開始しています...")
+
+        self.progress_queue = queue.Queue()
+        self.start_time = time.perf_counter()
+        threading.Thread(target=self._run_background_task, args=(target,) + args, daemon=True).start()
+        self.root.after(self.progress_interval_ms, self._poll_progress)
 
+    def _run_background_task(self, target, *args):
+        """一括処理の本体を実行し、終了をキューで通知（バックグラウンドスレッド）"""
+        try:
+            message = target(*args)
         except Exception as e:
-            self.status_var.set(f"エラーが発生しました: {str(e)}")
+            message = f"エラーが発生しました: {str(e)}"
         finally:
-            self.process_status.is_running = False
-            self.process_status.should_stop = False
-            self.update_button_states()
-            self.root.update()
+            self.finish_autotuner()
+        self.progress_queue.put(('finished', message))
+
+    def report_progress(self, processed_files, total_files, processed_bytes):
+        """進捗をキューで通知（バックグラウンドスレッドから呼ぶ）"""
+        self.progress_queue.put(('progress', processed_files, total_files, processed_bytes))
+
+    def _poll_progress(self):
+        """キューに溜まった進捗をまとめて表示に反映（UIスレッドで一定間隔で実行）"""
+        progress = None
+        finished_message = None
+        while True:
+            try:
+                message = self.progress_queue.get_nowait()
+            except queue.Empty:
+                break
+            if message[0] == 'progress':
+                progress = message[1:]  # 最新の値だけ表示すればよい
+            else:
+                finished_message = message[1]
+
+        if progress is not None:
+            processed_files, total_files, processed_bytes = progress
+            self.progress_var.set((processed_files / total_files) * 100)
+            if not self.process_status.should_stop:  # 中止中の表示は上書きしない
+                self.status_var.set(self.format_progress(processed_files, total_files, processed_bytes))
+
+        if finished_message is None:
+            self.root.after(self.progress_interval_ms, self._poll_progress)
+            return
+
+        # 状態のクリーンアップ
+        self.status_var.set(finished_message)
+        self.process_status.is_running = False
+        self.process_status.should_stop = False
+        self.update_button_states()
+
+    def format_progress(self, processed_files, total_files, processed_bytes):
+        """処理件数・処理速度・残り時間の表示文字列を作成"""
+        text = f"処理中... {processed_files}/{total_files}"
+        elapsed = time.perf_counter() - self.start_time
+        if elapsed > 0:
+            files_per_sec = processed_files / elapsed
+            mb_per_sec = processed_bytes / (1024 * 1024) / elapsed
+            remaining = (total_files - processed_files) / files_per_sec
+            minutes, seconds = divmod(int(remaining), 60)
+            text += f"  {files_per_sec:.1f} 枚/秒  {mb_per_sec:.1f} MB/秒  残り約 {minutes}:{seconds:02d}"
+        tuner = self.autotuner
+        if tuner is not None:
+            text += f"  並列数 {tuner.workers}" + ("（確定）" if tuner.converged else "（調整中）")
+        return text
 
     def validate_folder(self, folder):
         """フォルダの検証"""
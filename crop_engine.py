@@ -0,0 +1,731 @@
+"""切り取り・リサイズ処理のエンジン
+
+Tkに依存しない画像処理の本体。ImageCropper・BatchProcessorのGUIと、
+ワーカープロセスやコマンドラインから共通で使う。
+"""
+import hashlib
+import json
+import math
+import os
+import threading
+from contextlib import nullcontext
+from dataclasses import dataclass, asdict
+from enum import Enum, auto
+from typing import Optional, Tuple
+
+from PIL import Image, ImageOps
+
+
+# 定数定義
+TARGET_RESOLUTIONS = {
+    "1024:1024": [(1024, 1024)],
+    "832/1216": [
+        (1216, 832),   # 横長モード
+        (832, 1216)    # 縦長モード
+    ],
+    "768/1344": [
+        (1344, 768),   # 横長モード
+        (768, 1344)    # 縦長モード
+    ],
+    "896/1152": [
+        (1152, 896),   # 横長モード
+        (896, 1152)    # 縦長モード
+    ]
+}
+
+
+class AlignMode(Enum):
+    TOP_LEFT = auto()
+    TOP_CENTER = auto()
+    TOP_RIGHT = auto()
+    CENTER_LEFT = auto()
+    CENTER = auto()
+    CENTER_RIGHT = auto()
+    BOTTOM_LEFT = auto()
+    BOTTOM_CENTER = auto()
+    BOTTOM_RIGHT = auto()
+
+
+@dataclass
+class CropSpec:
+    """一括切り取りの設定（反転・回転後の画像上の切り取り範囲と変換）"""
+    coords: dict  # 回転後の画像上の切り取り範囲 {'x1', 'y1', 'x2', 'y2'}
+    rotation_angle: int = 0
+    free_rotation_angle: float = 0
+    is_flipped: bool = False
+    target_size: Optional[Tuple[int, int]] = None  # リサイズ後のサイズ（リサイズしない場合はNone）
+    bg_color: Tuple[int, int, int, int] = (0, 0, 0, 0)  # 範囲外を塗る色（RGBA）
+
+    @classmethod
+    def from_crop_settings(cls, settings, crop_modes=TARGET_RESOLUTIONS):
+        """ImageCropper._save_crop_settings の辞書から作成"""
+        target_size = None
+        if settings['resize_save_mode']:
+            target_size = tuple(crop_modes[settings['current_mode']][settings['mode_index']])
+        bg_color = (0, 0, 0, 0) if settings['use_transparent'] else tuple(settings['bg_color'])
+        return cls(
+            dict(settings['coords']),
+            settings['rotation_angle'],
+            settings['free_rotation_angle'],
+            settings['is_flipped'],
+            target_size,
+            bg_color
+        )
+
+    @classmethod
+    def from_dict(cls, data):
+        """JSONなどの辞書から作成（to_dict の逆変換）"""
+        target_size = data.get('target_size')
+        return cls(
+            coords={key: float(data['coords'][key]) for key in ('x1', 'y1', 'x2', 'y2')},
+            rotation_angle=int(data.get('rotation_angle', 0)),
+            free_rotation_angle=float(data.get('free_rotation_angle', 0)),
+            is_flipped=bool(data.get('is_flipped', False)),
+            target_size=tuple(target_size) if target_size else None,
+            bg_color=tuple(data.get('bg_color', (0, 0, 0, 0)))
+        )
+
+    def to_dict(self):
+        """JSONに保存できる辞書に変換"""
+        return asdict(self)
+
+
+@dataclass
+class ResizeSpec:
+    """一括リサイズの設定"""
+    output_size: Optional[Tuple[int, int]] = None  # 出力サイズ（Noneの場合はTARGET_RESOLUTIONSから自動選択）
+    resize_mode: str = "CROP"  # "CROP"（トリミング）または "FIT"（フィット）
+    align_mode: AlignMode = AlignMode.CENTER
+    use_transparent: bool = False
+    bg_color: Tuple[int, int, int] = (255, 255, 255)  # フィット時の余白の色（RGB）
+
+    @property
+    def output_mode(self):
+        """出力画像のモード"""
+        return 'RGBA' if self.use_transparent else 'RGB'
+
+
+def parse_hex_color(color):
+    """'#RRGGBB' 形式の色をRGBタプルに変換"""
+    if len(color) != 7 or not color.startswith('#'):
+        raise ValueError(f"Invalid color: {color}")
+    return tuple(int(color[i:i+2], 16) for i in (1, 3, 5))
+
+
+def parse_output_size(output_size):
+    """出力サイズ設定（"AUTO"または"幅x高さ"形式）を変換（AUTOの場合はNone）"""
+    if output_size == "AUTO":
+        return None
+    width, height = map(int, output_size.split('x'))
+    return (width, height)
+
+
+def select_bucket(size):
+    """アスペクト比が最も近い TARGET_RESOLUTIONS の解像度を選ぶ"""
+    original_ratio = size[0] / size[1]
+    best_score = float('inf')
+    best_resolution = None
+
+    for resolutions in TARGET_RESOLUTIONS.values():
+        for target_width, target_height in resolutions:
+            target_ratio = target_width / target_height
+            score = abs(original_ratio - target_ratio)
+            if score < best_score:
+                best_score = score
+                best_resolution = (target_width, target_height)
+    return best_resolution
+
+
+def calculate_paste_position(align_mode, target_size, resized_size):
+    """アライメントモードに基づいて貼り付け位置を計算"""
+    target_w, target_h = target_size
+    resized_w, resized_h = resized_size
+    
+    # 水平位置の計算
+    if align_mode in [AlignMode.TOP_LEFT, AlignMode.CENTER_LEFT, AlignMode.BOTTOM_LEFT]:
+        paste_x = 0
+    elif align_mode in [AlignMode.TOP_RIGHT, AlignMode.CENTER_RIGHT, AlignMode.BOTTOM_RIGHT]:
+        paste_x = target_w - resized_w
+    else:  # CENTER
+        paste_x = (target_w - resized_w) // 2
+
+    # 垂直位置の計算
+    if align_mode in [AlignMode.TOP_LEFT, AlignMode.TOP_CENTER, AlignMode.TOP_RIGHT]:
+        paste_y = 0
+    elif align_mode in [AlignMode.BOTTOM_LEFT, AlignMode.BOTTOM_CENTER, AlignMode.BOTTOM_RIGHT]:
+        paste_y = target_h - resized_h
+    else:  # CENTER
+        paste_y = (target_h - resized_h) // 2
+
+    return paste_x, paste_y
+
+
+def calculate_crop_box(img_size, target_size, align_mode):
+    """アライメントモードに基づいて切り取り範囲を計算"""
+    img_width, img_height = img_size
+    target_width, target_height = target_size
+    
+    ratio = max(target_width / img_width, target_height / img_height)
+    new_width = int(img_width * ratio)
+    new_height = int(img_height * ratio)
+    
+    if align_mode in [AlignMode.TOP_LEFT, AlignMode.TOP_CENTER, AlignMode.TOP_RIGHT]:
+        y = 0
+    elif align_mode in [AlignMode.CENTER_LEFT, AlignMode.CENTER, AlignMode.CENTER_RIGHT]:
+        y = (new_height - target_height) // 2
+    else:
+        y = new_height - target_height
+
+    if align_mode in [AlignMode.TOP_LEFT, AlignMode.CENTER_LEFT, AlignMode.BOTTOM_LEFT]:
+        x = 0
+    elif align_mode in [AlignMode.TOP_CENTER, AlignMode.CENTER, AlignMode.BOTTOM_CENTER]:
+        x = (new_width - target_width) // 2
+    else:
+        x = new_width - target_width
+
+    return (x, y, x + target_width, y + target_height), (new_width, new_height)
+
+
+def calculate_resize_size(img_size, target_size, resize_mode):
+    """リサイズ後（トリミング・配置前）の画像サイズを計算"""
+    if resize_mode == "CROP":
+        ratio = max(target_size[0] / img_size[0], target_size[1] / img_size[1])
+    else:
+        ratio = min(target_size[0] / img_size[0], target_size[1] / img_size[1])
+    return (int(img_size[0] * ratio), int(img_size[1] * ratio))
+
+
+def resize_image(img, spec, target_size):
+    """出力モードに変換済みの画像を target_size にリサイズ
+
+    Args:
+        img: 元画像（spec.output_mode に変換済み）
+        spec: ResizeSpec
+        target_size: 出力サイズ
+    """
+    if spec.resize_mode == "CROP":
+        # トリミングモード
+        crop_box, resize_size = calculate_crop_box(img.size, target_size, spec.align_mode)
+        resized_img = img.resize(resize_size, Image.Resampling.LANCZOS)
+        return resized_img.crop(crop_box)
+
+    # フィットモード
+    new_size = calculate_resize_size(img.size, target_size, spec.resize_mode)
+    resized_img = img.resize(new_size, Image.Resampling.LANCZOS)
+
+    # 背景画像の作成
+    if spec.use_transparent:
+        final_img = Image.new('RGBA', target_size, (0, 0, 0, 0))
+    else:
+        final_img = Image.new('RGB', target_size, spec.bg_color)
+
+    # リサイズ画像の配置
+    paste_x, paste_y = calculate_paste_position(spec.align_mode, target_size, new_size)
+    final_img.paste(resized_img, (paste_x, paste_y))
+    return final_img
+
+
+def _affine_multiply(outer, inner):
+    """アフィン変換 (a, b, c, d, e, f) の合成（inner → outer の順に適用）"""
+    a1, b1, c1, d1, e1, f1 = outer
+    a2, b2, c2, d2, e2, f2 = inner
+    return (
+        a1 * a2 + b1 * d2, a1 * b2 + b1 * e2, a1 * c2 + b1 * f2 + c1,
+        d1 * a2 + e1 * d2, d1 * b2 + e1 * e2, d1 * c2 + e1 * f2 + f1
+    )
+
+
+def _affine_invert(matrix):
+    """アフィン変換の逆変換"""
+    a, b, c, d, e, f = matrix
+    det = a * e - b * d
+    inv_a, inv_b, inv_d, inv_e = e / det, -b / det, -d / det, a / det
+    return (
+        inv_a, inv_b, -(inv_a * c + inv_b * f),
+        inv_d, inv_e, -(inv_d * c + inv_e * f)
+    )
+
+
+def compose_crop_transform(source_size, is_flipped, free_rotation_angle, rotation_angle):
+    """元画像の座標から反転・自由回転・90度回転後の座標へのアフィン変換を計算
+
+    座標はピクセル中心を整数とする（OpenCVと同じ）。
+
+    Returns:
+        (変換 (a, b, c, d, e, f), 変換後の画像サイズ) のタプル
+    """
+    width, height = source_size
+    matrix = (1, 0, 0, 0, 1, 0)
+
+    # 左右反転
+    if is_flipped:
+        matrix = (-1, 0, width - 1, 0, 1, 0)
+
+    # 自由回転（cv2.getRotationMatrix2Dと同じ、はみ出さないようにキャンバスを拡張）
+    if free_rotation_angle != 0:
+        radian = math.radians(free_rotation_angle)
+        cos_a = math.cos(radian)
+        sin_a = math.sin(radian)
+        center_x, center_y = width / 2, height / 2
+        new_width = int(height * abs(sin_a) + width * abs(cos_a))
+        new_height = int(height * abs(cos_a) + width * abs(sin_a))
+        rotation = (
+            cos_a, sin_a, (1 - cos_a) * center_x - sin_a * center_y + new_width / 2 - center_x,
+            -sin_a, cos_a, sin_a * center_x + (1 - cos_a) * center_y + new_height / 2 - center_y
+        )
+        matrix = _affine_multiply(rotation, matrix)
+        width, height = new_width, new_height
+
+    # 90度単位の時計回りの回転
+    quarter = (rotation_angle // 90) % 4
+    if quarter == 1:
+        matrix = _affine_multiply((0, -1, height - 1, 1, 0, 0), matrix)
+        width, height = height, width
+    elif quarter == 2:
+        matrix = _affine_multiply((-1, 0, width - 1, 0, -1, height - 1), matrix)
+    elif quarter == 3:
+        matrix = _affine_multiply((0, 1, 0, -1, 0, width - 1), matrix)
+        width, height = height, width
+
+    return matrix, (width, height)
+
+
+def warp_crop(source, matrix, output_size, bg_color, smooth):
+    """出力範囲に必要な部分だけを元画像から切り出して1回でワープ
+
+    Args:
+        source: 元画像（RGBA以外は切り出した範囲だけを変換する）
+        matrix: 元画像の座標から出力画像の座標へのアフィン変換
+        output_size: 出力サイズ (幅, 高さ)
+        bg_color: 元画像の外側を塗る色
+        smooth: Trueの場合はLANCZOS4（OpenCV）、Falseの場合は最近傍で補間
+    """
+    output_width, output_height = output_size
+    inverse = _affine_invert(matrix)
+    a, b, _, d, e, _ = matrix
+
+    # 出力範囲の四隅を元画像上に逆変換し、補間に必要な余白を加えた範囲だけを使う
+    xs, ys = [], []
+    for x, y in ((-0.5, -0.5), (output_width - 0.5, -0.5),
+                 (-0.5, output_height - 0.5), (output_width - 0.5, output_height - 0.5)):
+        xs.append(inverse[0] * x + inverse[1] * y + inverse[2])
+        ys.append(inverse[3] * x + inverse[4] * y + inverse[5])
+    # 1/2以下に縮小する場合は先に整数倍で縮小してエイリアシングを防ぐ
+    reduce_factor = int(1 / min(math.hypot(a, d), math.hypot(b, e))) if smooth else 1
+    # LANCZOS4の参照範囲（5ピクセル）は縮小後の画素単位なので、縮小前は reduce_factor 倍に広げ、
+    # 縮小ブロックの境界のずれの分も加える
+    pad = 5 * max(1, reduce_factor) + max(1, reduce_factor)
+    region_box = (
+        max(0, math.floor(min(xs)) - pad),
+        max(0, math.floor(min(ys)) - pad),
+        min(source.width, math.ceil(max(xs)) + pad + 1),
+        min(source.height, math.ceil(max(ys)) + pad + 1)
+    )
+    if region_box[0] >= region_box[2] or region_box[1] >= region_box[3]:
+        # 元画像と重ならない場合は背景色のみ
+        return Image.new('RGBA', output_size, bg_color)
+
+    region = source.crop(region_box)
+    if region.mode != 'RGBA':
+        # 元画像全体ではなく使う範囲だけをRGBAに変換する
+        region = region.convert('RGBA')
+    matrix = _affine_multiply(matrix, (1, 0, region_box[0], 0, 1, region_box[1]))
+
+    if reduce_factor >= 2:
+        region = region.reduce(reduce_factor)
+        offset = (reduce_factor - 1) / 2
+        matrix = _affine_multiply(matrix, (reduce_factor, 0, offset, 0, reduce_factor, offset))
+
+    if smooth:
+        import cv2
+        import numpy as np
+
+        warped = cv2.warpAffine(
+            np.asarray(region),
+            np.array(matrix, dtype=np.float64).reshape(2, 3),
+            output_size,
+            flags=cv2.INTER_LANCZOS4,
+            borderMode=cv2.BORDER_CONSTANT,
+            borderValue=bg_color
+        )
+        return Image.fromarray(warped)
+
+    # PILの変換は出力→入力の逆変換で、ピクセル中心が0.5ずれる
+    a, b, c, d, e, f = _affine_invert(matrix)
+    data = (a, b, c - 0.5 * (a + b) + 0.5, d, e, f - 0.5 * (d + e) + 0.5)
+    return region.transform(output_size, Image.AFFINE, data,
+                            resample=Image.Resampling.NEAREST, fillcolor=bg_color)
+
+
+def render_crop(source, crop_box, is_flipped, free_rotation_angle, rotation_angle, bg_color, output_size=None):
+    """反転・回転後の画像上の crop_box を元画像から切り取る
+
+    反転・自由回転・90度回転・切り取りを1つのアフィン変換にまとめ、
+    切り取り範囲に対応する元画像の部分だけを変換する。
+
+    Args:
+        source: 元画像
+        crop_box: 反転・回転後の画像上の切り取り範囲 (x1, y1, x2, y2)
+        is_flipped, free_rotation_angle, rotation_angle: 元画像に適用する変換
+        bg_color: 範囲外を塗る色（RGBA）
+        output_size: リサイズ後のサイズ（Noneの場合は切り取ったサイズのまま）
+    """
+    matrix, _ = compose_crop_transform(source.size, is_flipped, free_rotation_angle, rotation_angle)
+
+    # 切り取り範囲の左上を原点にする（範囲外は背景色で埋まる）
+    x1, y1, x2, y2 = crop_box
+    matrix = _affine_multiply((1, 0, -x1, 0, 1, -y1), matrix)
+    crop_size = (x2 - x1, y2 - y1)
+    output_size = tuple(output_size) if output_size else crop_size
+
+    if free_rotation_angle != 0:
+        # 自由回転と出力サイズへの拡大縮小を1回のワープで行う
+        if output_size != crop_size:
+            scale_x = output_size[0] / crop_size[0]
+            scale_y = output_size[1] / crop_size[1]
+            matrix = _affine_multiply(
+                (scale_x, 0, 0.5 * scale_x - 0.5, 0, scale_y, 0.5 * scale_y - 0.5), matrix)
+        return warp_crop(source, matrix, output_size, bg_color, smooth=True)
+
+    # 反転・90度回転・切り取りは画素をそのまま移し、リサンプルはリサイズの1回だけ
+    cropped_img = warp_crop(source, matrix, crop_size, bg_color, smooth=False)
+    if output_size != crop_size:
+        cropped_img = cropped_img.resize(output_size, Image.Resampling.LANCZOS)
+    return cropped_img
+
+
+class CancellableWriter:
+    """書き込みのたびに中止を確認するファイルラッパー
+
+    fileno() を持たないため、Pillowは圧縮データを少しずつ write() に渡し、
+    大きな画像のエンコード中でも中止できる。
+    """
+
+    def __init__(self, fp, check_stop):
+        self.fp = fp
+        self.check_stop = check_stop
+
+    def write(self, data):
+        self.check_stop()
+        return self.fp.write(data)
+
+    def tell(self):
+        return self.fp.tell()
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        return self.fp.seek(offset, whence)
+
+    def flush(self):
+        self.fp.flush()
+
+
+def save_image_atomic(image, output_path, check_stop=None, **save_options):
+    """一時ファイルに書き出してから置き換える（中止・失敗時に書きかけのファイルを残さない）
+
+    Args:
+        image: 保存する画像
+        output_path: 出力先のパス
+        check_stop: 書き込みの合間に呼ぶ中止確認（中止時は例外を送出する）
+        save_options: Image.save に渡すオプション（formatは必須）
+    """
+    temp_path = f"{output_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(temp_path, 'wb') as fp:
+            image.save(CancellableWriter(fp, check_stop) if check_stop else fp, **save_options)
+        os.replace(temp_path, output_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def estimate_peak_memory(source_size, source_mode, output_mode, intermediate_sizes):
+    """ヘッダの情報から1枚の処理に必要なピーク時のメモリ量（バイト）を見積もる
+
+    Args:
+        source_size: 元画像のサイズ
+        source_mode: 元画像のモード（デコード直後の画像）
+        output_mode: 変換後のモード（変換後の画像と中間画像）
+        intermediate_sizes: 同時に存在するリサイズ後などの中間画像のサイズ
+    """
+    source_pixels = source_size[0] * source_size[1]
+    output_channels = Image.getmodebands(output_mode)
+    required = source_pixels * (Image.getmodebands(source_mode) + output_channels)
+    for width, height in intermediate_sizes:
+        required += width * height * output_channels
+    return required
+
+
+def _no_stop_check():
+    """中止確認をしない場合の既定値"""
+
+
+def crop_file(input_path, output_path, spec):
+    """1枚の画像を切り取ってPNGで保存（ワーカープロセスから呼び出せる）
+
+    変換と切り取り範囲はヘッダの画像サイズだけで決め、画素のデコードは1回だけ行う。
+
+    Args:
+        input_path: 入力画像パス
+        output_path: 出力画像パス（PNG）
+        spec: CropSpec
+    Returns:
+        保存した場合はTrue、切り取り範囲が小さすぎてスキップした場合はFalse
+    """
+    # ヘッダだけを読む（画素はwarp_cropで必要な範囲を切り出す時にデコードされる）
+    with Image.open(input_path) as img:
+        orig_width, orig_height = img.size
+        _, (processed_width, processed_height) = compose_crop_transform(
+            img.size, spec.is_flipped, spec.free_rotation_angle, spec.rotation_angle)
+
+        # スケールファクターを計算 (元サイズと処理後サイズの比率)
+        width_ratio = processed_width / orig_width
+        height_ratio = processed_height / orig_height
+
+        # 切り取り座標をスケーリング
+        crop_coords = spec.coords
+        scaled_coords = (
+            int(crop_coords['x1'] * width_ratio),
+            int(crop_coords['y1'] * height_ratio),
+            int(crop_coords['x2'] * width_ratio),
+            int(crop_coords['y2'] * height_ratio)
+        )
+        crop_width = scaled_coords[2] - scaled_coords[0]
+        crop_height = scaled_coords[3] - scaled_coords[1]
+
+        # 画像外の領域を含む場合は有効な切り取り範囲があるか確認（デコード前に判定）
+        if (scaled_coords[0] < 0 or scaled_coords[1] < 0 or
+            scaled_coords[2] > processed_width or scaled_coords[3] > processed_height):
+            if crop_width <= 10 or crop_height <= 10:
+                print(f"Warning: Image {input_path} is too small for the crop area.")
+                return False
+
+        cropped_img = render_crop(
+            img, scaled_coords, spec.is_flipped, spec.free_rotation_angle, spec.rotation_angle,
+            spec.bg_color, spec.target_size
+        )
+
+    # 画像を保存
+    cropped_img.save(output_path, "PNG")
+    return True
+
+
+def resize_file(input_path, output_path, spec, check_stop=None, reserve_memory=None):
+    """1枚の画像をリサイズしてPNGで保存
+
+    Args:
+        input_path: 入力画像パス
+        output_path: 出力画像パス（PNG）
+        spec: ResizeSpec
+        check_stop: デコード・リサイズ・書き込みの合間に呼ぶ中止確認（中止時は例外を送出する）
+        reserve_memory: 推定メモリ量（バイト）を受け取り、デコード中に確保するコンテキストマネージャ
+    Returns:
+        入力ファイルのバイト数
+    """
+    check_stop = check_stop or _no_stop_check
+    reserve_memory = reserve_memory or nullcontext
+    check_stop()
+    with Image.open(input_path) as img:
+        # 開いたハンドルからファイルサイズを取る（パスを引き直さない）
+        input_bytes = os.fstat(img.fp.fileno()).st_size
+
+        # 出力サイズの決定とメモリの見積もりはヘッダの画像サイズだけで行う
+        target_size = spec.output_size or select_bucket(img.size)
+        resized_size = calculate_resize_size(img.size, target_size, spec.resize_mode)
+        required_bytes = estimate_peak_memory(
+            img.size, img.mode, spec.output_mode, [resized_size, target_size])
+
+        with reserve_memory(required_bytes):
+            img = img.convert(spec.output_mode)
+            check_stop()  # デコード後
+
+            final_img = resize_image(img, spec, target_size)
+            del img  # 保存前に中間画像を解放
+            check_stop()  # リサイズ後
+
+            save_image_atomic(final_img, output_path, check_stop,
+                              format='PNG', optimize=not spec.use_transparent)
+    return input_bytes
+
+
+def flip_file(input_path, output_path, check_stop=None, reserve_memory=None):
+    """1枚の画像を左右反転してPNGで保存
+
+    Args:
+        input_path: 入力画像パス
+        output_path: 出力画像パス（PNG）
+        check_stop: デコード・反転・書き込みの合間に呼ぶ中止確認（中止時は例外を送出する）
+        reserve_memory: 推定メモリ量（バイト）を受け取り、デコード中に確保するコンテキストマネージャ
+    Returns:
+        入力ファイルのバイト数
+    """
+    check_stop = check_stop or _no_stop_check
+    reserve_memory = reserve_memory or nullcontext
+    check_stop()
+    with Image.open(input_path) as img:
+        input_bytes = os.fstat(img.fp.fileno()).st_size
+        if img.mode in ('RGBA', 'LA') or (img.mode == 'P' and 'transparency' in img.info):
+            output_mode = 'RGBA'
+        else:
+            output_mode = 'RGB'
+
+        required_bytes = estimate_peak_memory(img.size, img.mode, output_mode, [img.size])
+        with reserve_memory(required_bytes):
+            img = img.convert(output_mode)
+            check_stop()  # デコード後
+
+            flipped_img = ImageOps.mirror(img)
+            del img
+            check_stop()  # 反転後
+
+            save_image_atomic(flipped_img, output_path, check_stop, format='PNG', optimize=True)
+    return input_bytes
+
+
+def file_digest(path, chunk_size=1 << 20):
+    """ファイル内容のハッシュ（BLAKE2b、16進文字列）"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def settings_digest(task_name, spec=None):
+    """処理の種類と設定のハッシュ（設定が変わると以前の出力は使わない）"""
+    data = {'task': task_name, 'spec': asdict(spec) if spec is not None else None}
+    text = json.dumps(data, sort_keys=True, default=lambda value: value.name if isinstance(value, Enum) else str(value))
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def run_with_fingerprint(worker, input_path, *args):
+    """worker を実行し、(結果, 入力のstat, 入力の内容ハッシュ) を返す（ワーカープロセスから呼び出せる）
+
+    stat とハッシュは処理前に取り、処理後にもう一度 stat を取る。処理中に入力が書き換えられた場合は
+    ハッシュをNoneにして記録させない（次回の実行でやり直しになる）。
+    """
+    stat = os.stat(input_path)
+    content_hash = file_digest(input_path)
+    result = worker(input_path, *args)
+    after = os.stat(input_path)
+    if (after.st_size, after.st_mtime_ns) != (stat.st_size, stat.st_mtime_ns):
+        content_hash = None
+    return result, stat, content_hash
+
+
+class OutputManifest:
+    """一括処理で完了した出力の記録（出力フォルダ内のJSONL、1件1行の追記のみ）
+
+    入力パス・サイズ・更新日時・内容のハッシュ・設定のハッシュ・出力パスを記録し、
+    再実行時は記録と一致する入力をスキップする。失敗した入力は記録しないため再実行で再試行される。
+    内容のハッシュを計算し直すのは、サイズが同じで更新日時だけが変わった入力のみ。
+    read_only=True の場合はファイルに一切書き込まない（dry-run 用）。
+    """
+    FILENAME = ".manifest.jsonl"
+
+    def __init__(self, input_folder, output_folder, settings_hash, read_only=False):
+        self.input_folder = input_folder
+        self.output_folder = output_folder
+        self.path = os.path.join(output_folder, self.FILENAME)
+        self.settings_hash = settings_hash
+        self.read_only = read_only
+        self.entries = {}
+        self.lock = threading.Lock()
+        self._file = None
+        self._load()
+
+    def _load(self):
+        """記録を読み込む（同じ入力の記録は後のものを使う）"""
+        try:
+            f = open(self.path, encoding='utf-8')
+        except FileNotFoundError:
+            return
+        line_count = 0
+        with f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # 中断時に書きかけだった行
+                self.entries[entry['input']] = entry
+                line_count += 1
+        if line_count > 2 * len(self.entries) + 1000 and not self.read_only:
+            self._compact()
+
+    def _compact(self):
+        """上書きされた古い記録を取り除いて書き直す"""
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            for entry in self.entries.values():
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        os.replace(temp_path, self.path)
+
+    def _key(self, input_path):
+        return os.path.relpath(input_path, self.input_folder).replace(os.sep, '/')
+
+    def is_up_to_date(self, input_path, output_path, fingerprint=None):
+        """同じ設定で処理済みで、入力が変わっておらず出力も残っているか
+
+        Args:
+            fingerprint: 索引などで分かっている入力の (サイズ, 更新日時, 内容のハッシュ)。
+                指定した場合は入力の stat とハッシュの計算を省く
+        """
+        entry = self.entries.get(self._key(input_path))
+        if entry is None or entry['settings'] != self.settings_hash:
+            return False
+        output_key = os.path.relpath(output_path, self.output_folder).replace(os.sep, '/')
+        if entry['output'] != output_key or not os.path.exists(output_path):
+            return False
+        if fingerprint is None:
+            stat = os.stat(input_path)
+            size, mtime_ns, content_hash = stat.st_size, stat.st_mtime_ns, None
+        else:
+            size, mtime_ns, content_hash = fingerprint
+        if entry['size'] != size:
+            return False
+        if entry['mtime_ns'] == mtime_ns:
+            return True
+
+        # 更新日時だけが変わった場合は内容を比較し、同じなら記録を更新してスキップ
+        content_hash = content_hash or file_digest(input_path)
+        if content_hash != entry['hash']:
+            return False
+        self._append(entry['input'], size, mtime_ns, content_hash, output_key)
+        return True
+
+    def record(self, input_path, output_path, stat, content_hash):
+        """完了した1件を追記する（複数のスレッドから呼び出せる）
+
+        content_hash が None の場合（処理中に入力が変わった場合）は記録しない。
+        """
+        if content_hash is None:
+            return
+        self._append(
+            self._key(input_path), stat.st_size, stat.st_mtime_ns, content_hash,
+            os.path.relpath(output_path, self.output_folder).replace(os.sep, '/')
+        )
+
+    def _append(self, input_key, size, mtime_ns, content_hash, output_key):
+        if self.read_only:
+            return
+        entry = {
+            'input': input_key,
+            'size': size,
+            'mtime_ns': mtime_ns,
+            'hash': content_hash,
+            'settings': self.settings_hash,
+            'output': output_key
+        }
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self.lock:
+            self.entries[entry['input']] = entry
+            if self._file is None:
+                self._file = open(self.path, 'a', encoding='utf-8')
+            self._file.write(line)
+            self._file.flush()  # 異常終了しても完了した分は残す
+
+    def close(self):
+        with self.lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
@@ -4,6 +4,241 @@ from PIL import Image, ImageTk
 import os
 from tkinterdnd2 import DND_FILES, TkinterDnD
 import math
+import time
+import threading
+import queue
+import concurrent.futures
+import multiprocessing
+from collections import OrderedDict
+from crop_engine import (
+    TARGET_RESOLUTIONS, CropSpec, compose_crop_transform, render_crop, crop_file, save_image_atomic
+)
+
+
+def build_pyramid(image, min_size):
+    """画像からミップマップ（元画像, 1/2, 1/4, 1/8 ...）を生成"""
+    levels = [image]
+    level = image
+    while min(level.size) >= min_size * 2:
+        level = level.reduce(2)
+        levels.append(level)
+    return levels
+
+
+class RenderCache:
+    """描画済みタイルのLRUキャッシュ（合計バイト数で上限を管理）"""
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.entries = OrderedDict()  # キー -> (値, バイト数)
+
+    def get(self, key):
+        """キャッシュから取得（ヒットした項目を最新にする）"""
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        self.entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, value, nbytes):
+        """キャッシュに追加し、上限を超えた分を古い順に破棄"""
+        if key in self.entries:
+            self.total_bytes -= self.entries.pop(key)[1]
+        if nbytes > self.max_bytes:
+            return
+
+        self.entries[key] = (value, nbytes)
+        self.total_bytes += nbytes
+        while self.total_bytes > self.max_bytes:
+            _, (_, evicted_bytes) = self.entries.popitem(last=False)
+            self.total_bytes -= evicted_bytes
+
+    def clear(self):
+        """キャッシュを空にする"""
+        self.entries.clear()
+        self.total_bytes = 0
+
+
+class DecodedSource:
+    """デコード済みの元画像を保持（ファイルの更新日時・サイズが変わった時だけ読み直す）
+
+    表示用と保存用で共有し、キー操作のたびにファイルを開き直さないようにする。
+    表示用画像はJPEGのDCTスケーリング（draft）で縮小デコードし、
+    元解像度のデコードは保存時に必要になるまで行わない。
+    """
+    MAX_DISPLAY_SIZE = 2000  # 表示用画像の最大サイズ
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.lock = threading.RLock()  # 先読みスレッドとの排他用（デコード済み画像の参照・更新）
+        self.full_lock = threading.Lock()  # 元解像度のデコードを1つに限る（表示用の処理はこのロックを取らない）
+        self.stat_key = None  # (更新日時, ファイルサイズ)
+        self.source_size = None  # 元画像のサイズ（ヘッダーから取得）
+        self.image = None  # 元解像度のRGBA画像（必要になった時にデコード）
+        self.display = None  # 表示用に縮小したRGBA画像
+        self.pyramid = None  # 表示用画像のミップマップ（先読み時に生成）
+
+    def _get_stat_key(self):
+        """ファイルの変更検出用のキーを取得"""
+        stat = os.stat(self.file_path)
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _check_modified(self):
+        """ファイルが変更されていればデコード済みの画像を破棄"""
+        stat_key = self._get_stat_key()
+        if stat_key != self.stat_key:
+            self.image = None
+            self.display = None
+            self.pyramid = None
+            self.stat_key = stat_key
+
+    def _get_display_size(self, size):
+        """表示用の縮小サイズを計算（縮小不要ならNone）"""
+        width, height = size
+        if width <= self.MAX_DISPLAY_SIZE and height <= self.MAX_DISPLAY_SIZE:
+            return None
+        # アスペクト比を維持しながら縮小
+        ratio = min(self.MAX_DISPLAY_SIZE / width, self.MAX_DISPLAY_SIZE / height)
+        return (int(width * ratio), int(height * ratio))
+
+    def _decode_display(self):
+        """表示用の画像をデコード（大きな画像は縮小デコード）"""
+        with Image.open(self.file_path) as img:
+            self.source_size = img.size
+            display_size = self._get_display_size(img.size)
+            if display_size is None:
+                # 縮小不要な場合は元解像度の画像をそのまま表示用にも使う
+                self.image = img.convert('RGBA')
+                self.display = self.image
+                return
+
+            # JPEGは表示サイズ以上の最小スケールでデコード（他の形式では何もしない）
+            img.draft(img.mode, display_size)
+            image = img.convert('RGBA')
+
+        # reduce()で大まかに縮小してからLANCZOSで仕上げる
+        self.display = image.resize(display_size, Image.Resampling.LANCZOS, reducing_gap=3.0)
+
+    def _decode_full(self):
+        """元解像度の画像をデコードして返す（self には設定しない）"""
+        with Image.open(self.file_path) as img:
+            return img.convert('RGBA')
+
+    def get_image(self):
+        """元解像度の画像を取得（呼び出し側で変更しないこと）
+
+        デコードは self.lock の外で行うため、保存中も表示側の操作（反転・回転のリセットなど）は待たされない。
+        """
+        with self.full_lock:
+            with self.lock:
+                self._check_modified()
+                if self.image is not None:
+                    return self.image
+                stat_key = self.stat_key
+
+            image = self._decode_full()
+
+            with self.lock:
+                self._check_modified()
+                # デコード中にファイルが変わっていなければ保持する（変わっていれば今回の呼び出しだけで使う）
+                if self.stat_key == stat_key and self.image is None:
+                    self.image = image
+                    self.source_size = image.size
+                return image
+
+    def get_display_image(self):
+        """表示用の画像を取得（呼び出し側で変更しないこと）"""
+        with self.lock:
+            self._check_modified()
+            if self.display is None:
+                self._decode_display()
+            return self.display
+
+    def get_pyramid(self, min_size):
+        """表示用画像のミップマップを取得"""
+        with self.lock:
+            display = self.get_display_image()
+            if self.pyramid is None or self.pyramid[0] is not display:
+                self.pyramid = build_pyramid(display, min_size)
+            return self.pyramid
+
+    @property
+    def memory_bytes(self):
+        """保持している画像のメモリ使用量（バイト）"""
+        images = [self.image] if self.display is self.image else [self.image, self.display]
+        if self.pyramid:
+            images += self.pyramid[1:]
+        return sum(img.width * img.height * len(img.getbands()) for img in images if img is not None)
+
+
+class ImagePrefetcher:
+    """フォルダ内の前後の画像をバックグラウンドでデコードしておく"""
+    # デコード前の画像のメモリ見積もり（表示用の最大サイズのRGBA）
+    ESTIMATED_BYTES = DecodedSource.MAX_DISPLAY_SIZE ** 2 * 4
+
+    def __init__(self, max_workers=2, memory_budget=512 * 1024 * 1024, pyramid_min_size=64):
+        self.executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="prefetch")
+        self.memory_budget = memory_budget  # 先読みに使うメモリの上限（バイト）
+        self.pyramid_min_size = pyramid_min_size
+        self.entries = {}  # ファイルパス -> Future(DecodedSource)
+
+    def _load(self, file_path):
+        """画像をデコードしてミップマップまで作成（ワーカースレッドで実行）"""
+        source = DecodedSource(file_path)
+        source.get_pyramid(self.pyramid_min_size)
+        return source
+
+    @staticmethod
+    def _is_failed(future):
+        """取り消された、または例外で終わった先読み（使わずに読み直す）"""
+        return future.cancelled() or (future.done() and future.exception() is not None)
+
+    def get(self, file_path):
+        """デコード済みの画像を取得（先読みされていない・失敗していた場合はその場でデコード）
+
+        コピー中のファイルを先読みして失敗した場合も、次の呼び出しでは読み直す。
+        その場でのデコードに失敗した場合は例外を送出し、結果は保持しない。
+        """
+        future = self.entries.get(file_path)
+        if future is None or self._is_failed(future):
+            self.entries.pop(file_path, None)
+            source = self._load(file_path)
+            future = concurrent.futures.Future()
+            future.set_result(source)
+            self.entries[file_path] = future
+        return future.result()
+
+    def discard(self, file_path):
+        """先読みした画像を破棄（読み込みに失敗した画像を次回読み直すため）"""
+        future = self.entries.pop(file_path, None)
+        if future is not None:
+            future.cancel()
+
+    def update(self, file_paths):
+        """優先順に並んだパスを先読みし、それ以外とメモリ上限を超える分は破棄"""
+        keep = []
+        used_bytes = 0
+        for file_path in file_paths:
+            future = self.entries.get(file_path)
+            if future is not None and future.done() and not future.cancelled() and future.exception() is None:
+                used_bytes += future.result().memory_bytes
+            else:
+                used_bytes += self.ESTIMATED_BYTES
+            # 先頭（表示中の画像）は上限に関係なく保持
+            if keep and used_bytes > self.memory_budget:
+                break
+            keep.append(file_path)
+
+        for file_path in list(self.entries):
+            if file_path not in keep:
+                self.entries.pop(file_path).cancel()
+
+        for file_path in keep:
+            future = self.entries.get(file_path)
+            if future is None or self._is_failed(future):
+                self.entries[file_path] = self.executor.submit(self._load, file_path)
+
 
 class ImageCropper:
     """画像切り抜きツール"""  
@@ -35,17 +270,48 @@ class ImageCropper:
         # 画像関連
         self.image = None
         self.pil_image = None
-        self.photo = None
         self.current_file_path = None
+        self.current_file_mtime = None
+        self.source = None  # デコード済みの元画像（DecodedSource）
         self.image_bounds = None
+        self.scaled_size = None
+
+        # タイル描画関連（表示範囲のタイルのみ生成する）
+        self.tile_size = 256  # タイル一辺のピクセル数
+        self.tiles = {}  # (列, 行) -> (キャンバスアイテムID, PhotoImage, プレビュー品質か)
+
+        # 描画スケジューラ（連続したイベントをまとめて1フレームに1回だけ再描画）
+        self.target_fps = 60
+        self.dirty_flags = set()  # 再描画が必要な項目（'zoom', 'rotation', 'layout', 'tiles', 'labels'）
+        self.frame_job = None
+        self.last_frame_time = 0.0
+
+        # プログレッシブズーム（高速プレビュー → 入力が止まってから高画質で描き直す）
+        self.preview_resample = Image.Resampling.BILINEAR  # プレビュー用の補間方法
+        self.refine_delay_ms = 200  # 最後の入力から高画質描画までの待機時間
+        self.refine_job = None
+        self.is_preview_render = False
+
+        # 描画済みタイルのキャッシュ（ズームや回転を戻した時に再利用）
+        self.render_cache_bytes = 256 * 1024 * 1024  # キャッシュの上限（バイト）
+        self.render_cache = RenderCache(self.render_cache_bytes)
+        self.view_key = None  # 現在の表示状態を表すキャッシュキー
+
+        # 表示用ミップマップ（元画像, 1/2, 1/4, ...）
+        self.pyramid = []
+        self.pyramid_source = None  # ミップマップ生成元の画像
+        self.pyramid_min_size = 64  # 最小レベルの短辺の目安
         
         # フリー回転用の変数を追加
         self.is_rotating = False
         self.rotation_start_x = None
         self.rotation_start_y = None
         self.free_rotation_angle = 0  # フリー回転用の角度
-        self.rotation_timer = None  # 回転処理用のタイマーを追加
+        self.pending_rotation_angle = None  # 次のフレームで反映する回転角度
         self.rotation_start_angle = 0 # 回転開始時の角度を追加
+        self.rotation_proxy_image = None  # 画面解像度に縮小した回転用プロキシ
+        self.rotation_preview_image = None  # ドラッグ中に表示する回転済みプロキシ
+        self.rotation_preview_size = None  # 回転後の表示画像サイズ（プロキシ換算前）
 
         # 左右反転用の変数
         self.is_flipped = False
@@ -55,6 +321,32 @@ class ImageCropper:
         
         # 保存先のデフォルトパス用変数を追加
         self.save_directory = None
+
+        # 保存処理のキュー（切り取り・書き出しをバックグラウンドで実行）
+        self.export_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="export")
+        self.export_results = queue.Queue()  # (ファイルパス, 例外) の完了通知
+        self.export_lock = threading.Lock()
+        self.export_path_futures = {}  # 書き出し待ちのファイルパス → そのパスへの最後の書き出し
+        self.export_pending = 0
+        self.export_finished = 0
+        self.export_failed = 0
+        self.export_last_error = None
+        self.export_poll_job = None
+
+        # 一括切り取り（プロセスプールで並列処理）
+        self.batch_workers = None  # ワーカープロセス数（Noneの場合はCPUコア数）
+        self.batch_executor = None
+        self.batch_results = queue.Queue()  # (ファイル名, Future) の完了通知
+        self.batch_futures = []
+        self.batch_window = None
+        self.batch_poll_job = None
+
+        # フォルダ内の画像移動と先読み
+        self.prefetch_count = 3  # 先読みする次の画像の枚数
+        self.prefetcher = ImagePrefetcher(memory_budget=512 * 1024 * 1024)
+        self.folder_files = []  # 現在のフォルダ内の画像ファイル名（ソート済み）
+        self.folder_key = None  # (フォルダパス, 更新日時)
         
         # 矩形選択関連
         self.rect_id = None
@@ -76,22 +368,8 @@ class ImageCropper:
 
 
         
-        # クロップモード設定を更新
-        self.crop_modes = {
-            "1024:1024": [(1024, 1024)],
-            "832/1216": [
-                (1216, 832),   # 横長モード
-                (832, 1216)    # 縦長モード
-            ],
-            "768/1344": [
-                (1344, 768),   # 横長モード
-                (768, 1344)    # 縦長モード
-            ],
-            "896/1152": [
-                (1152, 896),   # 横長モード
-                (896, 1152)    # 縦長モード
-            ]
-        }
+        # クロップモード設定（一括リサイズと共通の解像度）
+        self.crop_modes = {mode: list(sizes) for mode, sizes in TARGET_RESOLUTIONS.items()}
         # 各モードの現在のインデックスを保持
         self.mode_indices = {mode: 0 for mode in self.crop_modes}
         self.current_mode = "1024:1024"
@@ -125,6 +403,10 @@ class ImageCropper:
         
         self.image_size_label = tk.Label(self.size_frame, text="Image Size: -")
         self.image_size_label.pack(side=tk.LEFT, padx=5, pady=2)
+
+        # 保存キューの状態表示
+        self.export_status_label = tk.Label(self.size_frame, text="")
+        self.export_status_label.pack(side=tk.LEFT, padx=15, pady=2)
         
         #キャンバスコンテナ
         self.rect_size_label = tk.Label(self.size_frame, text="Selection Size: -")
@@ -143,9 +425,9 @@ class ImageCropper:
         self.scrollbar_y.pack(side=tk.RIGHT, fill=tk.Y)
         self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
 
-        # スクロールバーとキャンバスを連動
-        self.canvas.configure(xscrollcommand=self.scrollbar_x.set,
-                            yscrollcommand=self.scrollbar_y.set)
+        # スクロールバーとキャンバスを連動（スクロール時に表示タイルを更新）
+        self.canvas.configure(xscrollcommand=self._on_canvas_xscroll,
+                            yscrollcommand=self._on_canvas_yscroll)
         self.scrollbar_x.configure(command=self.canvas.xview)
         self.scrollbar_y.configure(command=self.canvas.yview)
 
@@ -260,6 +542,21 @@ class ImageCropper:
         )
         self.batch_button.pack(side=tk.LEFT, padx=5, pady=5)
         
+        # フォルダ内の前後の画像へ移動するボタン
+        self.prev_image_button = tk.Button(
+            self.second_button_frame,
+            text="◀ 前の画像",
+            command=self.show_previous_image
+        )
+        self.prev_image_button.pack(side=tk.LEFT, padx=5, pady=5)
+
+        self.next_image_button = tk.Button(
+            self.second_button_frame,
+            text="次の画像 ▶",
+            command=self.show_next_image
+        )
+        self.next_image_button.pack(side=tk.LEFT, padx=5, pady=5)
+
         # 一括切り取りボタンを二段目に移動
         self.batch_crop_button = tk.Button(
             self.second_button_frame,  # 二段目に配置
@@ -349,6 +646,10 @@ class ImageCropper:
         
         # 左右反転用のキーバインド
         self.root.bind('f', lambda e: self.flip_horizontal())
+
+        # フォルダ内の前後の画像へ移動（PageDown / PageUp）
+        self.root.bind('<Next>', lambda e: self.show_next_image())
+        self.root.bind('<Prior>', lambda e: self.show_previous_image())
         
         # フリー回転用のバインド
         self.canvas.bind('<Shift-Button-1>', self.start_free_rotation)
@@ -371,18 +672,23 @@ class ImageCropper:
 #--------------------------------------
 
     #画像表示
-    def display_image(self):
-        """画像の表示処理"""
+    def display_image(self, preview=False):
+        """画像の表示処理（preview=Trueの場合は高速な補間で描画）"""
         if self.pil_image is None:
             return
 
+        self.is_preview_render = preview
+        if not preview:
+            self._cancel_refine()
+
         # 矩形情報を相対位置で保存
         rect_info = self._save_rect_info()
         
         scaled_size = self._calculate_scaled_size()
-        scaled_image = self._create_scaled_image(scaled_size)
         
-        self.canvas.delete("all")
+        # 矩形は残したまま画像部分だけを描き直す
+        self.canvas.delete("image_bg")
+        self._clear_tiles()
         self._update_canvas_settings(scaled_size)
         self._draw_image(scaled_size)
         
@@ -392,15 +698,16 @@ class ImageCropper:
 
     def _calculate_scaled_size(self):
         """スケールされたサイズを計算"""
-        scaled_width = int(self.pil_image.size[0] * self.scale)
-        scaled_height = int(self.pil_image.size[1] * self.scale)
+        width, height = self._get_display_size()
+        scaled_width = int(width * self.scale)
+        scaled_height = int(height * self.scale)
         return (scaled_width, scaled_height)
 
-    def _create_scaled_image(self, scaled_size):
-        """スケールされた画像を作成"""
-        scaled_image = self.pil_image.resize(scaled_size, Image.Resampling.LANCZOS)
-        self.photo = ImageTk.PhotoImage(scaled_image)
-        return scaled_image
+    def _get_display_size(self):
+        """表示上の画像サイズ（フリー回転のプレビュー中は回転後のサイズ）"""
+        if self.rotation_preview_image is not None:
+            return self.rotation_preview_size
+        return self.pil_image.size
 
     def _update_canvas_settings(self, scaled_size):
         """キャンバスの設定を更新"""
@@ -447,15 +754,8 @@ class ImageCropper:
             x_position + scaled_width,
             y_position + scaled_height,
             fill=bg_color_hex,
-            outline=""
-        )
-
-        # 画像を中央に描画
-        self.canvas.create_image(
-            viewport_width // 2,
-            viewport_height // 2,
-            image=self.photo,
-            anchor="center"
+            outline="",
+            tags="image_bg"
         )
 
         # 画像の境界を保存
@@ -467,7 +767,258 @@ class ImageCropper:
             'center_x': viewport_width // 2,
             'center_y': viewport_height // 2
         }
+        self.scaled_size = scaled_size
+        self.view_key = self._get_view_key()
+
+        # 表示範囲にかかるタイルだけを描画
+        self._render_visible_tiles()
+
+    def _on_canvas_xscroll(self, *args):
+        """水平スクロール位置の変更を通知"""
+        self.scrollbar_x.set(*args)
+        self.request_redraw('tiles')
+
+    def _on_canvas_yscroll(self, *args):
+        """垂直スクロール位置の変更を通知"""
+        self.scrollbar_y.set(*args)
+        self.request_redraw('tiles')
+
+    def request_redraw(self, *flags):
+        """再描画を予約（次のフレームでまとめて処理）"""
+        self.dirty_flags.update(flags)
+        if self.frame_job is None:
+            # 前回の描画から1フレーム分の間隔を空ける
+            frame_interval = 1.0 / self.target_fps
+            elapsed = time.perf_counter() - self.last_frame_time
+            delay_ms = max(0, int((frame_interval - elapsed) * 1000))
+            self.frame_job = self.root.after(delay_ms, self._render_frame)
+
+    def _render_frame(self):
+        """保留中の変更をまとめて1回だけ再描画"""
+        self.frame_job = None
+        self.last_frame_time = time.perf_counter()
+        flags = self.dirty_flags
+        self.dirty_flags = set()
+        if self.pil_image is None:
+            return
+
+        layout_changed = 'layout' in flags and self._update_viewport_size()
+
+        if 'rotation' in flags and self.is_rotating:
+            self._apply_rotation(self.pending_rotation_angle)
+        elif 'zoom' in flags:
+            self.display_image(preview=True)
+            self._schedule_refine()
+        elif layout_changed:
+            self.display_image()
+        elif 'tiles' in flags:
+            self._render_visible_tiles()
+
+        if 'labels' in flags:
+            self._update_size_labels()
+
+    def _update_viewport_size(self):
+        """キャンバスサイズの変化を確認（変化していればスクロール位置をリセット）"""
+        current_width = self.canvas.winfo_width()
+        current_height = self.canvas.winfo_height()
+        if current_width == self.last_width and current_height == self.last_height:
+            return False
+
+        self.last_width = current_width
+        self.last_height = current_height
+        self.canvas.xview_moveto(0)
+        self.canvas.yview_moveto(0)
+        return True
+
+    def _clear_tiles(self):
+        """キャンバス上のタイルをすべて破棄"""
+        self.canvas.delete("tile")
+        self.tiles = {}
+
+    def _get_visible_tile_range(self):
+        """表示範囲にかかるタイルの範囲 (列1, 行1, 列2, 行2) を取得"""
+        scaled_width, scaled_height = self.scaled_size
+        tile = self.tile_size
+
+        # 画像左上を原点とした表示範囲（1タイル分を先読み）
+        view_x1 = self.canvas.canvasx(0) - self.image_bounds['x1'] - tile
+        view_y1 = self.canvas.canvasy(0) - self.image_bounds['y1'] - tile
+        view_x2 = view_x1 + self.canvas.winfo_width() + tile * 2
+        view_y2 = view_y1 + self.canvas.winfo_height() + tile * 2
+
+        x1 = max(0, int(view_x1))
+        y1 = max(0, int(view_y1))
+        x2 = min(scaled_width, math.ceil(view_x2))
+        y2 = min(scaled_height, math.ceil(view_y2))
+        if x1 >= x2 or y1 >= y2:
+            return None
+
+        return (x1 // tile, y1 // tile, (x2 - 1) // tile, (y2 - 1) // tile)
+
+    def _render_visible_tiles(self):
+        """表示範囲のタイルを描画し、範囲外のタイルを破棄"""
+        if self.pil_image is None or not self.image_bounds or not self.scaled_size:
+            return
+
+        tile_range = self._get_visible_tile_range()
+        if tile_range is None:
+            self._clear_tiles()
+            return
+        col1, row1, col2, row2 = tile_range
+
+        # 表示範囲から外れたタイルを破棄
+        for key in list(self.tiles):
+            col, row = key
+            if not (col1 <= col <= col2 and row1 <= row <= row2):
+                item_id = self.tiles.pop(key)[0]
+                self.canvas.delete(item_id)
+
+        # 未描画のタイルだけを生成（既存のタイルは再利用）
+        created = False
+        for row in range(row1, row2 + 1):
+            for col in range(col1, col2 + 1):
+                if (col, row) not in self.tiles:
+                    self._create_tile(col, row)
+                    created = True
+
+        if created:
+            # タイルは背景の上、矩形の下に配置
+            self.canvas.tag_lower("tile")
+            self.canvas.tag_lower("image_bg")
+
+    def _get_view_key(self):
+        """表示状態を表すキャッシュキーを作成（フリー回転中はキャッシュしない）"""
+        if self.is_rotating:
+            return None
+
+        bg_color = (0, 0, 0, 0) if self.use_transparent.get() else self.bg_color
+        return (
+            self.current_file_path,
+            self.current_file_mtime,
+            self.pil_image.size,
+            self.scaled_size,
+            round(self.scale, 6),
+            self.rotation_angle,
+            round(self.free_rotation_angle, 4),
+            self.is_flipped,
+            bg_color
+        )
+
+    def _create_tile(self, col, row):
+        """1枚のタイルを生成してキャンバスに配置"""
+        photo, is_preview = self._get_tile_photo(col, row)
+        item_id = self.canvas.create_image(
+            self.image_bounds['x1'] + col * self.tile_size,
+            self.image_bounds['y1'] + row * self.tile_size,
+            image=photo,
+            anchor="nw",
+            tags="tile"
+        )
+        self.tiles[(col, row)] = (item_id, photo, is_preview)
+
+    def _get_tile_photo(self, col, row):
+        """タイルのPhotoImageを取得（キャッシュにあれば再利用）
+
+        Returns:
+            (PhotoImage, プレビュー品質か) のタプル
+        """
+        cache_key = self.view_key + (col, row) if self.view_key else None
+        if cache_key:
+            photo = self.render_cache.get(cache_key)
+            if photo is not None:
+                return photo, False
+
+        photo = self._render_tile_photo(col, row)
+        if self.is_preview_render:
+            return photo, True
+
+        if cache_key:
+            self.render_cache.put(cache_key, photo, photo.width() * photo.height() * 4)
+        return photo, False
+
+    def _render_tile_photo(self, col, row):
+        """1枚のタイルをリサンプルしてPhotoImageを作成"""
+        tile = self.tile_size
+        scaled_width, scaled_height = self.scaled_size
+        x1 = col * tile
+        y1 = row * tile
+        x2 = min(x1 + tile, scaled_width)
+        y2 = min(y1 + tile, scaled_height)
+
+        # タイル範囲に対応するミップマップ上の範囲
+        source = self._get_pyramid_level()
+        src_width, src_height = source.size
+        ratio_x = src_width / scaled_width
+        ratio_y = src_height / scaled_height
+        box = (x1 * ratio_x, y1 * ratio_y, x2 * ratio_x, y2 * ratio_y)
+
+        # フィルタの参照範囲を含めて切り出してからリサンプル（タイル境界の継ぎ目を防ぐ）
+        pad = math.ceil(3 * max(1.0, ratio_x, ratio_y)) + 1
+        region_box = (
+            max(0, int(box[0]) - pad),
+            max(0, int(box[1]) - pad),
+            min(src_width, math.ceil(box[2]) + pad),
+            min(src_height, math.ceil(box[3]) + pad)
+        )
+        region = source.crop(region_box)
+        local_box = (
+            box[0] - region_box[0], box[1] - region_box[1],
+            box[2] - region_box[0], box[3] - region_box[1]
+        )
+
+        resample = self.preview_resample if self.is_preview_render else Image.Resampling.LANCZOS
+        tile_image = region.resize((x2 - x1, y2 - y1), resample, box=local_box)
+        return ImageTk.PhotoImage(tile_image)
+
+    def _schedule_refine(self):
+        """高画質描画を予約（新しい入力があれば古い予約は取り消す）"""
+        self._cancel_refine()
+        self.refine_job = self.root.after(self.refine_delay_ms, self._refine_tiles)
+
+    def _cancel_refine(self):
+        """予約済みの高画質描画を取り消す"""
+        if self.refine_job:
+            self.root.after_cancel(self.refine_job)
+            self.refine_job = None
+
+    def _refine_tiles(self):
+        """プレビュー品質のタイルをLANCZOSで描き直す"""
+        self.refine_job = None
+        self.is_preview_render = False
+        if self.pil_image is None or not self.scaled_size:
+            return
 
+        for key, (item_id, _, is_preview) in list(self.tiles.items()):
+            if is_preview:
+                photo, _ = self._get_tile_photo(*key)
+                self.canvas.itemconfigure(item_id, image=photo)
+                self.tiles[key] = (item_id, photo, False)
+
+
+    def _build_pyramid(self):
+        """表示画像からミップマップ（1/2, 1/4, 1/8 ...）を生成"""
+        if self.source and self.pil_image is self.source.display:
+            # 読み込み直後の画像は先読み時に作成したミップマップを使う
+            self.pyramid = self.source.get_pyramid(self.pyramid_min_size)
+        else:
+            self.pyramid = build_pyramid(self.pil_image, self.pyramid_min_size)
+        self.pyramid_source = self.pil_image
+
+    def _get_pyramid_level(self):
+        """表示サイズ以上の解像度を持つ最も小さいレベルを取得"""
+        # フリー回転のプレビュー中は画面解像度のプロキシをそのまま使う
+        if self.rotation_preview_image is not None:
+            return self.rotation_preview_image
+
+        # 回転・反転などで表示画像が差し替えられた場合は作り直す
+        if self.pyramid_source is not self.pil_image:
+            self._build_pyramid()
+
+        scaled_width, scaled_height = self.scaled_size
+        for level in reversed(self.pyramid):
+            if level.width >= scaled_width and level.height >= scaled_height:
+                return level
+        return self.pyramid[0]
 
     def _restore_selection(self):
         """選択範囲の復元"""
@@ -500,10 +1051,8 @@ class ImageCropper:
         if hasattr(self, 'original_display_image'):
             del self.original_display_image
         
-        # 現在の回転を打ち消す回転を適用
-        self.pil_image = Image.open(self.current_file_path)
-        if self.pil_image.mode != 'RGBA':
-            self.pil_image = self.pil_image.convert('RGBA')
+        # デコード済みの表示用画像に戻す
+        self.pil_image = self.source.get_display_image()
         
         self.display_image()
         
@@ -522,10 +1071,8 @@ class ImageCropper:
         # 反転フラグを更新
         self.is_flipped = not self.is_flipped
         
-        # 元の画像を読み込む
-        original_image = Image.open(self.current_file_path)
-        if original_image.mode != 'RGBA':
-            original_image = original_image.convert('RGBA')
+        # デコード済みの表示用画像から作り直す
+        original_image = self.source.get_display_image()
             
         # 反転を適用
         if self.is_flipped:
@@ -575,14 +1122,25 @@ class ImageCropper:
         # 現在の表示用画像をバックアップ
         self.rotation_backup_image = self.original_display_image.copy()
 
+        # 画面解像度のプロキシを作成（ドラッグ中はこれを回転して表示）
+        # 拡大表示中もキャンバスより大きくしない（1フレームの回転量をウィンドウサイズで抑える）
+        canvas_side = max(self.canvas.winfo_width(), self.canvas.winfo_height(), 1)
+        image_side = max(self.rotation_backup_image.width, self.rotation_backup_image.height)
+        proxy_ratio = min(1.0, self.scale, canvas_side / image_side)
+        if proxy_ratio < 1.0:
+            proxy_size = (
+                max(1, round(self.rotation_backup_image.width * proxy_ratio)),
+                max(1, round(self.rotation_backup_image.height * proxy_ratio))
+            )
+            self.rotation_proxy_image = self.rotation_backup_image.resize(
+                proxy_size, Image.Resampling.BILINEAR, reducing_gap=2.0)
+        else:
+            self.rotation_proxy_image = self.rotation_backup_image
+
     def do_free_rotation(self, event):
         """フリー回転の実行"""
         if not self.is_rotating or not self.pil_image:
             return
-
-        if self.rotation_timer:
-            self.root.after_cancel(self.rotation_timer)
-            self.rotation_timer = None
         
         dx = event.x - self.rotation_start_x
         delta_angle = dx * 0.3
@@ -591,7 +1149,9 @@ class ImageCropper:
         new_angle = (self.rotation_start_angle + delta_angle) % 360
         print(f"開始角度: {self.rotation_start_angle}, 変化量: {delta_angle}, 新角度: {new_angle}")
         
-        self.rotation_timer = self.root.after(5, lambda: self._apply_rotation(new_angle))
+        # 次のフレームで最新の角度だけを反映
+        self.pending_rotation_angle = new_angle
+        self.request_redraw('rotation')
 
     def _apply_rotation(self, angle):
         """回転を適用する（表示用）"""
@@ -607,35 +1167,61 @@ class ImageCropper:
         # 背景色の設定
         bg_color = (0, 0, 0, 0) if self.use_transparent.get() else self.bg_color
         
-        # バックアップ画像から新しい角度で回転（表示用）
-        if hasattr(self, 'pil_image'):
-            del self.pil_image
-        self.pil_image = self.rotation_backup_image.rotate(
+        # プロキシを新しい角度で回転（表示用、元解像度の回転はドラッグ終了時に行う）
+        self.rotation_preview_image = self.rotation_proxy_image.rotate(
             angle,
             expand=True,
             resample=Image.BILINEAR,
             fillcolor=bg_color
         )
+        self.rotation_preview_size = self._get_rotated_size(
+            self.rotation_backup_image.size, angle)
         
-        self.display_image()
+        self.display_image(preview=True)
         
         if rect_info:
             self._restore_rect_from_info(rect_info)
-        
-        self.rotation_timer = None
 
+    def _get_rotated_size(self, size, angle):
+        """expand=Trueで回転した後の画像サイズを計算"""
+        width, height = size
+        radian = math.radians(angle)
+        abs_cos = abs(math.cos(radian))
+        abs_sin = abs(math.sin(radian))
+        # 浮動小数点の誤差で1ピクセル大きくならないように丸める
+        return (
+            math.ceil(round(width * abs_cos + height * abs_sin, 6)),
+            math.ceil(round(width * abs_sin + height * abs_cos, 6))
+        )
 
     def end_free_rotation(self, event):
         """フリー回転の終了"""
-        if self.rotation_timer:
-            self.root.after_cancel(self.rotation_timer)
-            self.rotation_timer = None
-        
+        # まだ描画されていない角度があれば反映
+        if 'rotation' in self.dirty_flags:
+            self.dirty_flags.discard('rotation')
+            if self.is_rotating:
+                self.free_rotation_angle = self.pending_rotation_angle
+        
+        # 最終的な角度で表示用画像を一度だけ回転
+        if self.is_rotating and self.free_rotation_angle != self.rotation_start_angle:
+            bg_color = (0, 0, 0, 0) if self.use_transparent.get() else self.bg_color
+            self.pil_image = self.rotation_backup_image.rotate(
+                self.free_rotation_angle,
+                expand=True,
+                resample=Image.BILINEAR,
+                fillcolor=bg_color
+            )
+        self.rotation_preview_image = None
+        self.rotation_preview_size = None
+
         self.is_rotating = False
         
         # 回転操作終了時にバックアップを解放
         if hasattr(self, 'rotation_backup_image'):
             del self.rotation_backup_image
+        self.rotation_proxy_image = None
+
+        self.display_image()
         
         print(f"回転終了時の累積角度: {self.free_rotation_angle}")
             
@@ -796,7 +1382,7 @@ class ImageCropper:
                     self.current_rect_coords = [x1, y1]
                     self.rect_width = x2 - x1
                     self.rect_height = y2 - y1
-                    self._update_size_labels()
+                    self.request_redraw('labels')
 
         self.last_drag_y = event.y
         self.last_drag_x = event.x
@@ -904,10 +1490,7 @@ class ImageCropper:
         self.current_rect_coords = [new_x, new_y]
 
     def _handle_rect_creation(self, event):
-        """矩形の新規作成処理"""
-        if self.rect_id:
-            self.canvas.delete(self.rect_id)
-        
+        """矩形の新規作成処理（既存の矩形は座標だけを更新）"""
         constrained_pos = self._constrain_to_image(event) if self.boundary_restriction else (event.x, event.y)
         rect_dims = self._calculate_rect_dimensions(constrained_pos)
         self._create_new_rect(rect_dims)
@@ -985,33 +1568,80 @@ class ImageCropper:
             if hasattr(self, 'original_display_image'):
                 del self.original_display_image
             
-            # まず元画像を読み込み
-            original_image = Image.open(file_path)
-            if original_image.mode != 'RGBA':
-                original_image = original_image.convert('RGBA')
-
-            # 表示用の最大サイズを設定
-            MAX_DISPLAY_SIZE = 2000  # この値は調整可能
-
-            # 画像が大きすぎる場合は縮小
-            width, height = original_image.size
-            if width > MAX_DISPLAY_SIZE or height > MAX_DISPLAY_SIZE:
-                # アスペクト比を維持しながら縮小
-                ratio = min(MAX_DISPLAY_SIZE / width, MAX_DISPLAY_SIZE / height)
-                new_size = (int(width * ratio), int(height * ratio))
-                self.pil_image = original_image.resize(new_size, Image.Resampling.LANCZOS)
-            else:
-                self.pil_image = original_image
+            # 元画像をデコードして保持（先読み済みならすぐに取得できる）
+            self.source = self.prefetcher.get(file_path)
+            self.pil_image = self.source.get_display_image()
 
             # 元のファイルパスは保持（保存時に使用）
             self.current_file_path = file_path
+            self.current_file_mtime = os.path.getmtime(file_path)
             self._init_image_settings()
+            self._build_pyramid()
             self.display_image()
             self._update_size_labels()
 
+            # 前後の画像を先読み
+            self._update_prefetch()
+
         except Exception as e:
+            self.prefetcher.discard(file_path)
             tk.messagebox.showerror("Error", f"Failed to load image: {str(e)}")
 
+    def show_next_image(self):
+        """同じフォルダの次の画像を表示"""
+        self._navigate_folder(1)
+
+    def show_previous_image(self):
+        """同じフォルダの前の画像を表示"""
+        self._navigate_folder(-1)
+
+    def _navigate_folder(self, step):
+        """フォルダ内の画像を前後に移動"""
+        if not self.current_file_path:
+            return
+
+        files = self._get_folder_files()
+        current_name = os.path.basename(self.current_file_path)
+        if current_name not in files:
+            return
+
+        index = files.index(current_name) + step
+        if 0 <= index < len(files):
+            folder = os.path.dirname(self.current_file_path)
+            self.load_image_from_path(os.path.join(folder, files[index]))
+
+    def _get_folder_files(self):
+        """現在のフォルダ内の画像ファイル名を取得（フォルダが変更された時だけ読み直す）"""
+        folder = os.path.dirname(self.current_file_path)
+        folder_key = (folder, os.stat(folder).st_mtime_ns)
+        if folder_key != self.folder_key:
+            self.folder_files = sorted(
+                entry.name for entry in os.scandir(folder)
+                if entry.is_file() and self._is_valid_file_path(entry.name)
+            )
+            self.folder_key = folder_key
+        return self.folder_files
+
+    def _update_prefetch(self):
+        """表示中の画像の次のN枚と前の1枚を先読み"""
+        try:
+            files = self._get_folder_files()
+        except OSError:
+            return
+
+        current_name = os.path.basename(self.current_file_path)
+        if current_name not in files:
+            return
+
+        # 優先順: 表示中 → 次 → 前 → 次の次 ...
+        index = files.index(current_name)
+        order = [index, index + 1, index - 1] + list(range(index + 2, index + self.prefetch_count + 1))
+        folder = os.path.dirname(self.current_file_path)
+        file_paths = [self.current_file_path] + [
+            os.path.join(folder, files[i]) for i in order[1:] if 0 <= i < len(files)
+        ]
+        self.prefetcher.update(file_paths)
+
     def _show_file_dialog(self):
         """ファイル選択ダイアログを表示"""
         file_types = [
@@ -1054,31 +1684,21 @@ class ImageCropper:
             self.rect_id = None
 
     def save_crop(self, force_resize=False):
-        """選択範囲を保存"""
+        """選択範囲を保存（切り取りと書き出しはバックグラウンドで実行）"""
         if not self._can_save():
             return
 
-        cropped_image = self._get_cropped_image()
-        if cropped_image:
-            # リサイズが必要かどうかを確認
-            should_resize = force_resize or self.resize_save_mode
-            
-            if should_resize:
-                # 現在のモードのサイズを取得
-                current_size = self.crop_modes[self.current_mode][self.mode_indices[self.current_mode]]
-                target_width, target_height = current_size
+        # 切り取り設定は操作した時点の状態で確定させる
+        crop_settings = self._capture_crop_settings()
 
-                # 現在のサイズを確認
-                current_width, current_height = cropped_image.size
-                
-                # リサイズが必要な場合のみリサイズを実行
-                if current_width != target_width or current_height != target_height:
-                    cropped_image = cropped_image.resize(
-                        (target_width, target_height),
-                        Image.Resampling.LANCZOS
-                    )
+        # リサイズが必要かどうかを確認
+        if force_resize or self.resize_save_mode:
+            # 現在のモードのサイズを取得
+            crop_settings['target_size'] = self.crop_modes[self.current_mode][self.mode_indices[self.current_mode]]
 
-            self._save_image(cropped_image)
+        file_path = self._get_save_path()
+        if file_path:
+            self._submit_export(crop_settings, file_path)
 
     def _can_save(self):
         """保存可能か確認"""
@@ -1090,107 +1710,47 @@ class ImageCropper:
         """選択範囲の画像を取得（保存用）"""
         if not self.rect_id:
             return None
-        
-        # 元画像を読み込んで回転を適用
-        original_image = Image.open(self.current_file_path)
-        if original_image.mode != 'RGBA':
-            original_image = original_image.convert('RGBA')
-
-        if self.is_flipped:
-            original_image = original_image.transpose(Image.FLIP_LEFT_RIGHT)
-
-        # 背景色の設定
-        bg_color = (0, 0, 0, 0) if self.use_transparent.get() else self.bg_color
+        return self._render_crop(self._capture_crop_settings())
 
-        # 自由回転を適用
-        if self.free_rotation_angle != 0:
-            import cv2
-            import numpy as np
-            
-            img_array = np.array(original_image)
-            img_array = cv2.cvtColor(img_array, cv2.COLOR_RGBA2BGRA)
-            
-            height, width = img_array.shape[:2]
-            center = (width/2, height/2)
-            
-            # OpenCV用に背景色の順序を変換 (RGBA -> BGRA)
-            cv_bg_color = bg_color
-            if len(bg_color) == 4:
-                r, g, b, a = bg_color
-                cv_bg_color = (b, g, r, a)
-            
-            # 累積された最終角度で回転を適用
-            rotation_matrix = cv2.getRotationMatrix2D(center, self.free_rotation_angle, 1.0)
-            
-            abs_cos = abs(rotation_matrix[0,0])
-            abs_sin = abs(rotation_matrix[0,1])
-            new_width = int(height * abs_sin + width * abs_cos)
-            new_height = int(height * abs_cos + width * abs_sin)
-            
-            rotation_matrix[0, 2] += new_width/2 - center[0]
-            rotation_matrix[1, 2] += new_height/2 - center[1]
-            
-            rotated = cv2.warpAffine(
-                img_array,
-                rotation_matrix,
-                (new_width, new_height),
-                flags=cv2.INTER_LANCZOS4,
-                borderMode=cv2.BORDER_CONSTANT,
-                borderValue=cv_bg_color
-            )
-            
-            rotated = cv2.cvtColor(rotated, cv2.COLOR_BGRA2RGBA)
-            original_image = Image.fromarray(rotated)
+    def _capture_crop_settings(self):
+        """保存に必要な状態を取得（UIスレッドで呼び出す）"""
+        coords = self.canvas.coords(self.rect_id)
+        return {
+            'source': self.source,
+            'is_flipped': self.is_flipped,
+            'rotation_angle': self.rotation_angle,
+            'free_rotation_angle': self.free_rotation_angle,
+            'bg_color': (0, 0, 0, 0) if self.use_transparent.get() else self.bg_color,
+            # 表示用画像上の切り取り範囲
+            'display_coords': tuple(
+                (coord - self.image_bounds[origin]) / self.scale
+                for coord, origin in zip(coords, ('x1', 'y1', 'x1', 'y1'))
+            ),
+            'display_width': self.pil_image.size[0],
+            'target_size': None
+        }
 
-        # 90度回転を適用
-        if self.rotation_angle != 0:
-            original_image = original_image.rotate(
-                -self.rotation_angle,
-                expand=True,
-                fillcolor=bg_color
-            )
+    def _render_crop(self, settings):
+        """切り取り設定から元解像度の画像を切り取る（UIに触れないのでワーカーから呼び出せる）
+
+        反転・自由回転・90度回転・切り取りを1つのアフィン変換にまとめ、
+        切り取り範囲に対応する元画像の部分だけを変換する。
+        """
+        source_image = settings['source'].get_image()
+        _, (rotated_width, _) = compose_crop_transform(
+            source_image.size,
+            settings['is_flipped'],
+            settings['free_rotation_angle'],
+            settings['rotation_angle']
+        )
 
-        # スケール計算と座標変換
-        scale_factor = original_image.size[0] / self.pil_image.size[0]
-        coords = self.canvas.coords(self.rect_id)
-        
-        x1 = (coords[0] - self.image_bounds['x1']) / self.scale * scale_factor
-        y1 = (coords[1] - self.image_bounds['y1']) / self.scale * scale_factor
-        x2 = (coords[2] - self.image_bounds['x1']) / self.scale * scale_factor
-        y2 = (coords[3] - self.image_bounds['y1']) / self.scale * scale_factor
-        
-        x1, y1, x2, y2 = map(int, (x1, y1, x2, y2))
-        
-        # キャンバス外にはみ出す場合は、新しい画像を作成して合成
-        img_width, img_height = original_image.size
-        
-        if x1 < 0 or y1 < 0 or x2 > img_width or y2 > img_height:
-            # 画像外の領域を含む場合、必要なサイズの新しい画像を作成
-            crop_width = x2 - x1
-            crop_height = y2 - y1
-            
-            # 背景色で塗りつぶした新しい画像を作成
-            new_img = Image.new('RGBA', (crop_width, crop_height), bg_color)
-            
-            # 元画像から有効な部分を切り取る座標を計算
-            valid_x1 = max(0, x1)
-            valid_y1 = max(0, y1)
-            valid_x2 = min(img_width, x2)
-            valid_y2 = min(img_height, y2)
-            
-            # 有効な領域があれば切り取って合成
-            if valid_x2 > valid_x1 and valid_y2 > valid_y1:
-                valid_crop = original_image.crop((valid_x1, valid_y1, valid_x2, valid_y2))
-                
-                # 新しい画像の上に有効な領域を配置
-                paste_x = valid_x1 - x1
-                paste_y = valid_y1 - y1
-                new_img.paste(valid_crop, (paste_x, paste_y))
-                
-            return new_img
-        else:
-            # 通常の切り取り
-            return original_image.crop((x1, y1, x2, y2))
+        # 表示用画像上の座標を回転後の元解像度の座標に変換
+        scale_factor = rotated_width / settings['display_width']
+        crop_box = tuple(int(coord * scale_factor) for coord in settings['display_coords'])
+        return render_crop(
+            source_image, crop_box, settings['is_flipped'], settings['free_rotation_angle'],
+            settings['rotation_angle'], settings['bg_color']
+        )
 
     def _convert_coords_to_image_space(self, coords):
         """キャンバス座標を画像座標に変換"""
@@ -1209,13 +1769,88 @@ class ImageCropper:
             int(y2 + 0.5)   # 下端は四捨五入
         )
 
-    def _save_image(self, image):
-        """画像を保存"""
-        file_path = self._get_save_path()
-        if file_path:
-            image.save(file_path, "PNG")
+    def _submit_export(self, crop_settings, file_path):
+        """保存処理をキューに追加
+
+        同じファイルへの書き出しが残っている場合は、その完了を待ってから書き込む（後から保存した内容が残る）。
+        """
+        path_key = os.path.abspath(file_path)
+        with self.export_lock:
+            # 書き出し完了前に同じファイル名が提案されないよう予約
+            previous = self.export_path_futures.get(path_key)
+            future = self.export_executor.submit(self._export_crop, crop_settings, file_path, previous)
+            self.export_path_futures[path_key] = future
+        self.export_pending += 1
+        self._update_export_status()
+
+        future.add_done_callback(lambda f: self._release_export_path(path_key, f))
+        future.add_done_callback(lambda f: self.export_results.put((file_path, f.exception())))
+
+        if self.export_poll_job is None:
+            self.export_poll_job = self.root.after(100, self._poll_export_results)
+
+    def _export_crop(self, crop_settings, file_path, previous=None):
+        """切り取り・リサイズ・PNG書き出し（ワーカースレッドで実行）
+
+        Args:
+            previous: 同じファイルへの先行する書き出し（完了を待ってから書き込む）
+        """
+        cropped_image = self._render_crop(crop_settings)
+
+        # リサイズが必要な場合のみリサイズを実行
+        target_size = crop_settings['target_size']
+        if target_size and cropped_image.size != tuple(target_size):
+            cropped_image = cropped_image.resize(target_size, Image.Resampling.LANCZOS)
+
+        # 先行する書き出しは先にキューから取り出されて実行中なので、待っても詰まらない
+        if previous is not None:
+            concurrent.futures.wait([previous])
+        save_image_atomic(cropped_image, file_path, format='PNG')
+
+    def _release_export_path(self, path_key, future):
+        """書き出しの完了時に予約を外す（後続の書き出しがあればそのまま残す）"""
+        with self.export_lock:
+            if self.export_path_futures.get(path_key) is future:
+                del self.export_path_futures[path_key]
+
+    def _poll_export_results(self):
+        """完了した保存処理を反映（UIスレッドで定期的に実行）"""
+        self.export_poll_job = None
+        while True:
+            try:
+                file_path, error = self.export_results.get_nowait()
+            except queue.Empty:
+                break
+
+            self.export_pending -= 1
+            if error is None:
+                self.export_finished += 1
+            else:
+                # 失敗はステータス表示に出し、操作は止めない
+                self.export_failed += 1
+                self.export_last_error = f"{os.path.basename(file_path)}: {error}"
+                print(f"Error saving {file_path}: {error}")
+
+        self._update_export_status()
+        if self.export_pending > 0:
+            self.export_poll_job = self.root.after(100, self._poll_export_results)
+
+    def _update_export_status(self):
+        """保存キューの状態を表示"""
+        text = f"Export: 処理中 {self.export_pending} / 完了 {self.export_finished}"
+        if self.export_failed:
+            text += f" / 失敗 {self.export_failed} ({self.export_last_error})"
+        self.export_status_label.config(text=text, fg='red' if self.export_failed else 'black')
     def batch_crop(self):
-        """現在の矩形設定を使用して同じフォルダの全画像を一括処理する"""
+        """現在の矩形設定を使用して同じフォルダの全画像を一括処理する
+
+        処理はプロセスプールで並列に行い、進捗は after() でキューから反映する。
+        """
+        if self.batch_executor is not None:
+            # 実行中の場合は進捗ウィンドウを前面に出す
+            self.batch_window.lift()
+            return
+
         if not self.current_file_path or not self.rect_id:
             messagebox.showerror("エラー", "画像と切り取り範囲を選択してください。")
             return
@@ -1227,69 +1862,131 @@ class ImageCropper:
         output_folder = os.path.join(current_folder, "batch_cropped")
         os.makedirs(output_folder, exist_ok=True)
         
-        # 現在の切り取り設定を保存
-        crop_settings = self._save_crop_settings()
+        # 現在の切り取り設定を保存（ワーカープロセスに渡せる形に変換）
+        crop_settings = CropSpec.from_crop_settings(self._save_crop_settings(), self.crop_modes)
         
         # サポートされているファイル形式を定義
         supported_formats = ('.png', '.jpg', '.jpeg', '.webp', '.bmp', '.gif', '.tiff')
         
-        # フォルダ内の全画像を取得
+        # フォルダ内の全画像を取得（現在処理中のファイルは同じファイルなのでスキップ）
         image_files = [f for f in os.listdir(current_folder) 
                     if os.path.isfile(os.path.join(current_folder, f)) and 
-                    os.path.splitext(f)[1].lower() in supported_formats]
-        
-        processed_count = 0
-        error_count = 0
-        
-        # 進捗ダイアログを表示
-        progress_window = tk.Toplevel(self.root)
-        progress_window.title("一括処理中")
-        progress_window.geometry("300x100")
-        progress_window.transient(self.root)
-        progress_window.grab_set()
-        
-        progress_label = tk.Label(progress_window, text="画像を処理しています...")
-        progress_label.pack(pady=10)
-        
-        count_label = tk.Label(progress_window, text=f"0 / {len(image_files)}")
-        count_label.pack(pady=5)
-        
-        progress_window.update()
-        
-        # 各画像ファイルを処理
-        for i, filename in enumerate(image_files):
+                    os.path.splitext(f)[1].lower() in supported_formats and
+                    os.path.join(current_folder, f) != self.current_file_path]
+        if not image_files:
+            messagebox.showinfo("処理完了", "処理対象の画像がありません。")
+            return
+
+        self.batch_total = len(image_files)
+        self.batch_done = 0
+        self.batch_processed = 0
+        self.batch_errors = 0
+        self.batch_cancelled = 0
+        self.batch_start_time = time.perf_counter()
+        self.batch_output_folder = output_folder
+        self._create_batch_progress_window()
+
+        # 各画像ファイルをワーカープロセスに投入
+        # 先読み・書き出しのスレッドが動いているTkのプロセスをforkしないよう、spawnで起動する
+        # （crop_file はTkに依存しない crop_engine にあるため、ワーカーでTkの画面は作られない）
+        self.batch_executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=self.batch_workers, mp_context=multiprocessing.get_context("spawn"))
+        self.batch_futures = []
+        for filename in image_files:
+            input_path = os.path.join(current_folder, filename)
+            output_path = os.path.join(output_folder, os.path.splitext(filename)[0] + ".png")
+            future = self.batch_executor.submit(crop_file, input_path, output_path, crop_settings)
+            future.add_done_callback(lambda f, name=filename: self.batch_results.put((name, f)))
+            self.batch_futures.append(future)
+
+        self.batch_poll_job = self.root.after(100, self._poll_batch_results)
+
+    def _create_batch_progress_window(self):
+        """一括処理の進捗ウィンドウを作成（モーダルにせず他の操作を続けられる）"""
+        self.batch_window = tk.Toplevel(self.root)
+        self.batch_window.title("一括処理中")
+        self.batch_window.geometry("360x160")
+        self.batch_window.transient(self.root)
+        self.batch_window.protocol("WM_DELETE_WINDOW", self.cancel_batch_crop)
+
+        progress_label = tk.Label(self.batch_window, text="画像を処理しています...")
+        progress_label.pack(pady=(10, 5))
+
+        self.batch_progress_var = tk.DoubleVar()
+        ttk.Progressbar(self.batch_window, length=300, mode='determinate',
+                        variable=self.batch_progress_var).pack(pady=5)
+
+        self.batch_count_label = tk.Label(self.batch_window, text=f"0 / {self.batch_total}")
+        self.batch_count_label.pack()
+
+        self.batch_rate_label = tk.Label(self.batch_window, text="")
+        self.batch_rate_label.pack()
+
+        self.batch_cancel_button = tk.Button(self.batch_window, text="中止", command=self.cancel_batch_crop)
+        self.batch_cancel_button.pack(pady=5)
+
+    def cancel_batch_crop(self):
+        """一括処理を中止（未着手の画像を取り消し、処理中の画像の完了を待つ）"""
+        if self.batch_executor is None:
+            return
+        for future in self.batch_futures:
+            future.cancel()
+        self.batch_executor.shutdown(wait=False, cancel_futures=True)
+        self.batch_cancel_button.config(state=tk.DISABLED, text="中止しています...")
+
+    def _poll_batch_results(self):
+        """完了した一括処理の結果を反映（UIスレッドで定期的に実行）"""
+        self.batch_poll_job = None
+        while True:
             try:
-                input_path = os.path.join(current_folder, filename)
-                output_path = os.path.join(output_folder, os.path.splitext(filename)[0] + ".png")
-                
-                # 現在処理中のファイルをスキップ（同じファイルなので）
-                if input_path == self.current_file_path:
-                    continue
-                    
-                # 画像を処理
-                success = self._batch_process_image(input_path, output_path, crop_settings)
-                
-                if success:
-                    processed_count += 1
-                else:
-                    error_count += 1
-                    
-                # 進捗表示を更新
-                count_label.config(text=f"{i+1} / {len(image_files)}")
-                progress_window.update()
-                
-            except Exception as e:
-                print(f"Error processing {filename}: {e}")
-                error_count += 1
-        
-        # 処理完了後、ダイアログを閉じる
-        progress_window.destroy()
-        
+                filename, future = self.batch_results.get_nowait()
+            except queue.Empty:
+                break
+
+            self.batch_done += 1
+            if future.cancelled():
+                self.batch_cancelled += 1
+            elif future.exception() is not None:
+                print(f"Error processing {filename}: {future.exception()}")
+                self.batch_errors += 1
+            elif future.result():
+                self.batch_processed += 1
+            else:
+                self.batch_errors += 1
+
+        self._update_batch_progress()
+        if self.batch_done < self.batch_total:
+            self.batch_poll_job = self.root.after(100, self._poll_batch_results)
+        else:
+            self._finish_batch_crop()
+
+    def _update_batch_progress(self):
+        """進捗・処理速度・残り時間を表示"""
+        self.batch_progress_var.set(self.batch_done / self.batch_total * 100)
+        self.batch_count_label.config(text=f"{self.batch_done} / {self.batch_total}")
+
+        finished = self.batch_processed + self.batch_errors
+        elapsed = time.perf_counter() - self.batch_start_time
+        if finished and elapsed > 0:
+            rate = finished / elapsed
+            remaining = (self.batch_total - self.batch_done) / rate
+            minutes, seconds = divmod(int(remaining), 60)
+            self.batch_rate_label.config(text=f"{rate:.1f} 枚/秒  残り約 {minutes}:{seconds:02d}")
+
+    def _finish_batch_crop(self):
+        """一括処理の後片付けと結果表示"""
+        self.batch_executor.shutdown(wait=False)
+        self.batch_executor = None
+        self.batch_futures = []
+        self.batch_window.destroy()
+        self.batch_window = None
+
         # 結果を表示
-        messagebox.showinfo("処理完了", 
-                            f"処理完了: {processed_count}件\n"
-                            f"エラー: {error_count}件\n"
-                            f"保存先: {output_folder}")
+        message = (f"処理完了: {self.batch_processed}件\n"
+                   f"エラー: {self.batch_errors}件\n")
+        if self.batch_cancelled:
+            message += f"中止: {self.batch_cancelled}件\n"
+        messagebox.showinfo("処理完了", message + f"保存先: {self.batch_output_folder}")
 
     def _save_crop_settings(self):
         """現在の切り取り設定を保存"""
@@ -1321,146 +2018,6 @@ class ImageCropper:
             'bg_color': self.bg_color
         }
 
-    def _batch_process_image(self, input_path, output_path, settings):
-        """一括処理用の画像処理"""
-        try:
-            # 元画像を読み込む
-            img = Image.open(input_path)
-            if img.mode != 'RGBA':
-                img = img.convert('RGBA')
-                
-            # 背景色の設定
-            bg_color = (0, 0, 0, 0) if settings['use_transparent'] else settings['bg_color']
-                
-            # 左右反転
-            if settings['is_flipped']:
-                img = img.transpose(Image.FLIP_LEFT_RIGHT)
-                
-            # 90度単位の回転
-            if settings['rotation_angle'] != 0:
-                img = img.rotate(
-                    -settings['rotation_angle'],
-                    expand=True,
-                    fillcolor=bg_color
-                )
-                
-            # 自由回転
-            if settings['free_rotation_angle'] != 0:
-                import cv2
-                import numpy as np
-                
-                # OpenCVで回転処理
-                img_array = np.array(img)
-                img_array = cv2.cvtColor(img_array, cv2.COLOR_RGBA2BGRA)
-                
-                height, width = img_array.shape[:2]
-                center = (width/2, height/2)
-                
-                # OpenCV用に背景色の順序を変換 (RGBA -> BGRA)
-                cv_bg_color = bg_color
-                if len(bg_color) == 4:
-                    r, g, b, a = bg_color
-                    cv_bg_color = (b, g, r, a)
-                
-                # 回転行列を計算して適用
-                rotation_matrix = cv2.getRotationMatrix2D(center, settings['free_rotation_angle'], 1.0)
-                
-                abs_cos = abs(rotation_matrix[0,0])
-                abs_sin = abs(rotation_matrix[0,1])
-                new_width = int(height * abs_sin + width * abs_cos)
-                new_height = int(height * abs_cos + width * abs_sin)
-                
-                rotation_matrix[0, 2] += new_width/2 - center[0]
-                rotation_matrix[1, 2] += new_height/2 - center[1]
-                
-                rotated = cv2.warpAffine(
-                    img_array,
-                    rotation_matrix,
-                    (new_width, new_height),
-                    flags=cv2.INTER_LANCZOS4,
-                    borderMode=cv2.BORDER_CONSTANT,
-                    borderValue=cv_bg_color
-                )
-                
-                rotated = cv2.cvtColor(rotated, cv2.COLOR_BGRA2RGBA)
-                img = Image.fromarray(rotated)
-            
-            # 元画像のサイズと処理後の画像サイズを取得
-            orig_width, orig_height = Image.open(input_path).size
-            processed_width, processed_height = img.size
-            
-            # スケールファクターを計算 (元サイズと処理後サイズの比率)
-            width_ratio = processed_width / orig_width
-            height_ratio = processed_height / orig_height
-            
-            # 切り取り座標をスケーリング
-            crop_coords = settings['coords']
-            scaled_coords = (
-                int(crop_coords['x1'] * width_ratio),
-                int(crop_coords['y1'] * height_ratio),
-                int(crop_coords['x2'] * width_ratio),
-                int(crop_coords['y2'] * height_ratio)
-            )
-            
-            # 座標が画像内に収まるか確認
-            if (scaled_coords[0] < 0 or scaled_coords[1] < 0 or
-                scaled_coords[2] > img.width or scaled_coords[3] > img.height):
-                
-                # 画像外の領域を含む場合、必要なサイズの新しい画像を作成
-                crop_width = scaled_coords[2] - scaled_coords[0]
-                crop_height = scaled_coords[3] - scaled_coords[1]
-                
-                # 有効な切り取り範囲があるか確認
-                if crop_width <= 10 or crop_height <= 10:
-                    print(f"Warning: Image {input_path} is too small for the crop area.")
-                    return False
-                    
-                # 背景色で塗りつぶした新しい画像を作成
-                new_img = Image.new('RGBA', (crop_width, crop_height), bg_color)
-                
-                # 元画像から有効な部分を切り取る座標を計算
-                valid_x1 = max(0, scaled_coords[0])
-                valid_y1 = max(0, scaled_coords[1])
-                valid_x2 = min(img.width, scaled_coords[2])
-                valid_y2 = min(img.height, scaled_coords[3])
-                
-                # 有効な領域があれば切り取って合成
-                if valid_x2 > valid_x1 and valid_y2 > valid_y1:
-                    valid_crop = img.crop((valid_x1, valid_y1, valid_x2, valid_y2))
-                    
-                    # 新しい画像の上に有効な領域を配置
-                    paste_x = valid_x1 - scaled_coords[0]
-                    paste_y = valid_y1 - scaled_coords[1]
-                    new_img.paste(valid_crop, (paste_x, paste_y))
-                    
-                cropped_img = new_img
-            else:
-                # 通常の切り取り
-                cropped_img = img.crop(scaled_coords)
-            
-            # リサイズが必要な場合
-            if settings['resize_save_mode']:
-                current_size = self.crop_modes[settings['current_mode']][settings['mode_index']]
-                target_width, target_height = current_size
-                
-                # 現在のサイズを確認
-                current_width, current_height = cropped_img.size
-                
-                # リサイズが必要な場合のみリサイズを実行
-                if current_width != target_width or current_height != target_height:
-                    cropped_img = cropped_img.resize(
-                        (target_width, target_height),
-                        Image.Resampling.LANCZOS
-                    )
-            
-            # 画像を保存
-            cropped_img.save(output_path, "PNG")
-            return True
-            
-        except Exception as e:
-            print(f"Error in batch processing {input_path}: {e}")
-            return False
-          
     def set_save_directory(self):
         """保存先ディレクトリを設定"""
         # 現在の保存先かファイルのディレクトリをデフォルトとして表示
@@ -1512,7 +2069,10 @@ class ImageCropper:
         counter = 1
         file_path = base_path
         
-        while os.path.exists(file_path):
+        # 書き出し待ちのファイル名も使用済みとして扱う
+        with self.export_lock:
+            reserved = set(self.export_path_futures)
+        while os.path.exists(file_path) or os.path.abspath(file_path) in reserved:
             file_path = os.path.join(directory, f"{base_name}_cropped_{counter:03d}.png")
             counter += 1
         
@@ -1570,7 +2130,7 @@ class ImageCropper:
         self._update_zoom_scale(event)
         
         if old_scale != self.scale:
-            self.display_image()
+            self._zoom_changed()
 
     def zoom_with_key(self, factor):
         """キーボードでのズーム処理"""
@@ -1581,7 +2141,11 @@ class ImageCropper:
         self.scale *= factor
         
         if old_scale != self.scale:
-            self.display_image()
+            self._zoom_changed()
+
+    def _zoom_changed(self):
+        """ズーム変更時はプレビューを次のフレームで描画し、高画質描画は入力が止まってから行う"""
+        self.request_redraw('zoom')
 
     def _update_zoom_scale(self, event):
         """ズームスケールを更新"""
@@ -1767,33 +2331,8 @@ class ImageCropper:
         if not self._is_root_window_event(event) or not self._has_image():
             return
         
-        # 現在のウィンドウ状態を取得
-        current_width = self.canvas.winfo_width()
-        current_height = self.canvas.winfo_height()
-        
-        if current_width != self.last_width or current_height != self.last_height:
-            self.last_width = current_width
-            self.last_height = current_height
-            
-            # スクロール位置をリセット
-            self.canvas.xview_moveto(0)
-            self.canvas.yview_moveto(0)
-            
-            # 矩形情報を保存
-            rect_info = self._save_rect_info()
-            
-            # キャンバスをクリアして再描画
-            self.canvas.delete("all")
-            self.canvas.update()
-            
-            # 画像とキャンバスの設定を更新
-            scaled_size = self._calculate_scaled_size()
-            self._update_canvas_settings(scaled_size)
-            self._draw_image(scaled_size)
-            
-            # 矩形を復元
-            if rect_info:
-                self._restore_rect_from_info(rect_info)
+        # リサイズ中の連続したイベントは次のフレームでまとめて再描画
+        self.request_redraw('layout')
     
     # マウスイベント関連のメソッド
     def on_press(self, event):
@@ -1925,39 +2464,21 @@ class ImageCropper:
     
     # 共通の矩形操作メソッド
     def _create_rect(self, x1, y1, x2, y2):
-        """共通の矩形作成処理"""
-        # 中央からの相対位置を計算
-        center_x = self.image_bounds['center_x']
-        center_y = self.image_bounds['center_y']
-        
-        # 現在の位置から中央からの相対位置を計算
-        rel_x1 = x1 - center_x
-        rel_y1 = y1 - center_y
-        rel_x2 = x2 - center_x
-        rel_y2 = y2 - center_y
-        
-        # 相対位置を保存
-        self.rect_relative_pos = {
-            'x1': rel_x1 / self.scale,
-            'y1': rel_y1 / self.scale,
-            'x2': rel_x2 / self.scale,
-            'y2': rel_y2 / self.scale
-        }
-        
-        if self.rect_id:
-            self.canvas.delete(self.rect_id)
-        
-        self.rect_id = self.canvas.create_rectangle(
-            x1, y1, x2, y2,
-            outline="red",
-            width=2
-        )
+        """共通の矩形作成処理（既存の矩形があれば座標だけを更新）"""
+        if self.rect_id and self.canvas.type(self.rect_id):
+            self.canvas.coords(self.rect_id, x1, y1, x2, y2)
+        else:
+            self.rect_id = self.canvas.create_rectangle(
+                x1, y1, x2, y2,
+                outline="red",
+                width=2
+            )
         self.current_rect_coords = [x1, y1]
         self.rect_width = x2 - x1
         self.rect_height = y2 - y1
         
-        # サイズ表示を更新
-        self._update_size_labels()
+        # サイズ表示は次のフレームでまとめて更新
+        self.request_redraw('labels')
 
     def _save_rect_info(self):
         """矩形情報の保存（中央からの相対位置で保存）"""
@@ -2000,8 +2521,16 @@ class ImageCropper:
     def _update_size_labels(self):
         """サイズ表示の更新"""
         if self.pil_image:
-            width, height = self.pil_image.size
-            self.image_size_label.config(text=f"Image Size: {width} x {height}")
+            width, height = self._get_display_size()
+            text = f"Image Size: {width} x {height}"
+            if self.source:
+                # 縮小表示している場合は元画像の解像度と、デコード済み元画像のメモリ使用量を表示
+                display = self.source.display
+                if display is not None and self.source.source_size != display.size:
+                    source_width, source_height = self.source.source_size
+                    text += f"  (Original: {source_width} x {source_height})"
+                text += f"  (Source: {self.source.memory_bytes / (1024 * 1024):.1f} MB)"
+            self.image_size_label.config(text=text)
         
         if self.rect_id:
             # 矩形の実際のサイズを計算（スケールを考慮）
@@ -0,0 +1,234 @@
+"""画像フォルダのメタデータ索引
+
+データセットのルートフォルダごとにSQLiteの索引（.image_index.sqlite3）を作り、
+各画像のサイズ・更新日時・画像サイズ・モード・透過の有無・EXIFの向き・内容のハッシュ・
+TARGET_RESOLUTIONS の解像度を記録する。
+
+更新は差分のみ（サイズと更新日時が変わったファイルだけヘッダを読み直す）で、
+読み直しはプロセスプールで並列に行う。一括処理の計画は索引への問い合わせで済み、
+フォルダの走査や画像のオープンは不要になる。
+"""
+import concurrent.futures
+import os
+import sqlite3
+import sys
+from dataclasses import dataclass
+from typing import Optional
+
+from PIL import Image
+
+from crop_engine import select_bucket, file_digest
+
+
+# 索引に登録する拡張子（一括処理で扱うすべての形式）
+INDEX_FORMATS = {'.png', '.jpg', '.jpeg', '.webp', '.bmp', '.gif', '.tiff'}
+
+INDEX_FILENAME = ".image_index.sqlite3"
+
+# 読み直すファイルがこの数未満ならプロセスを起動せずに処理する
+PARALLEL_THRESHOLD = 32
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS images (
+    path TEXT PRIMARY KEY,
+    folder TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    width INTEGER,
+    height INTEGER,
+    mode TEXT,
+    has_alpha INTEGER,
+    orientation INTEGER,
+    content_hash TEXT,
+    bucket TEXT
+);
+CREATE INDEX IF NOT EXISTS images_folder ON images (folder, path);
+"""
+
+
+@dataclass
+class ImageRecord:
+    """索引の1件（パスはルートからの相対パス、区切りは '/'）
+
+    画像として開けなかったファイルは width 以降が None になる。
+    """
+    path: str
+    folder: str
+    size: int
+    mtime_ns: int
+    width: Optional[int] = None
+    height: Optional[int] = None
+    mode: Optional[str] = None
+    has_alpha: Optional[bool] = None
+    orientation: Optional[int] = None
+    content_hash: Optional[str] = None
+    bucket: Optional[str] = None
+
+
+def read_image_header(root, path, size, mtime_ns):
+    """1枚の画像のヘッダを読み、ImageRecord を返す（ワーカープロセスから呼び出せる）
+
+    画素はデコードしない。内容のハッシュはファイル全体を読んで計算する。
+    """
+    record = ImageRecord(path=path, folder=os.path.dirname(path), size=size, mtime_ns=mtime_ns)
+    full_path = os.path.join(root, *path.split('/'))
+    try:
+        with Image.open(full_path) as img:
+            record.width, record.height = img.size
+            record.mode = img.mode
+            record.has_alpha = img.mode in ('RGBA', 'LA', 'PA', 'RGBa', 'La') or 'transparency' in img.info
+            record.orientation = read_orientation(img)
+            bucket = select_bucket(img.size)
+            record.bucket = f"{bucket[0]}x{bucket[1]}"
+        record.content_hash = file_digest(full_path)
+    except Exception as e:
+        # 進捗表示（標準エラー出力）の行を崩さないよう改行してから同じ出力に書く
+        print(f"\nError reading {full_path}: {e}", file=sys.stderr)
+    return record
+
+
+def read_orientation(img):
+    """ヘッダに含まれるEXIFの向き（1〜8、無ければ1）
+
+    PNGの getexif() は eXIf チャンクを探すために画素を読み込むことがあるため使わない。
+    """
+    if hasattr(img, 'tag_v2'):
+        return int(img.tag_v2.get(0x0112, 1))  # TIFF
+    raw_exif = img.info.get('exif')
+    if not raw_exif:
+        return 1
+    exif = Image.Exif()
+    exif.load(raw_exif)
+    return int(exif.get(0x0112, 1))
+
+
+class ImageIndex:
+    """データセットのルートフォルダごとのメタデータ索引"""
+
+    def __init__(self, root):
+        self.root = os.path.abspath(root)
+        self.path = os.path.join(self.root, INDEX_FILENAME)
+        self.connection = sqlite3.connect(self.path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _iter_folders(self, exclude_folders):
+        """ルート以下のフォルダを (相対パス, 絶対パス) で返す（隠しフォルダと除外フォルダは辿らない）"""
+        exclude_folders = {os.path.abspath(folder) for folder in exclude_folders}
+        for folder, subfolders, _ in os.walk(self.root):
+            subfolders[:] = sorted(
+                name for name in subfolders
+                if not name.startswith('.') and os.path.abspath(os.path.join(folder, name)) not in exclude_folders
+            )
+            relative = os.path.relpath(folder, self.root).replace(os.sep, '/')
+            yield ('' if relative == '.' else relative), folder
+
+    def refresh(self, max_workers=None, exclude_folders=(), progress=None):
+        """索引を差分更新する
+
+        フォルダを走査してサイズと更新日時を比較し、追加・変更されたファイルだけヘッダを読み直す。
+        消えたファイルとフォルダの記録は削除する。
+
+        Args:
+            max_workers: ヘッダを読むワーカープロセス数（None の場合はCPUコア数）
+            exclude_folders: 索引に含めないフォルダ（一括処理の出力先など）
+            progress: (読み直した件数, 読み直す件数) を受け取る関数
+        Returns:
+            (追加・更新した件数, 削除した件数, 変更がなかった件数)
+        """
+        changed = []
+        removed = 0
+        unchanged = 0
+        seen_folders = set()
+        with self.connection:
+            for folder, full_folder in self._iter_folders(exclude_folders):
+                seen_folders.add(folder)
+                known = {
+                    path: (size, mtime_ns) for path, size, mtime_ns in self.connection.execute(
+                        "SELECT path, size, mtime_ns FROM images WHERE folder = ?", (folder,))
+                }
+                with os.scandir(full_folder) as entries:
+                    for entry in entries:
+                        if not entry.is_file() or os.path.splitext(entry.name)[1].lower() not in INDEX_FORMATS:
+                            continue
+                        path = f"{folder}/{entry.name}" if folder else entry.name
+                        stat = entry.stat()
+                        if known.pop(path, None) == (stat.st_size, stat.st_mtime_ns):
+                            unchanged += 1
+                        else:
+                            changed.append((path, stat.st_size, stat.st_mtime_ns))
+                if known:
+                    self.connection.executemany("DELETE FROM images WHERE path = ?", ((path,) for path in known))
+                    removed += len(known)
+
+            # 消えたフォルダの記録を削除
+            for (folder,) in self.connection.execute("SELECT DISTINCT folder FROM images").fetchall():
+                if folder not in seen_folders:
+                    removed += self.connection.execute("DELETE FROM images WHERE folder = ?", (folder,)).rowcount
+
+        for done, record in enumerate(self._read_headers(changed, max_workers), 1):
+            self._store(record)
+            if done % 500 == 0:
+                self.connection.commit()  # 中断しても読み直した分は残す
+            if progress:
+                progress(done, len(changed))
+        self.connection.commit()
+        return len(changed), removed, unchanged
+
+    def _read_headers(self, changed, max_workers):
+        """変更されたファイルのヘッダを読む（件数が多い場合はプロセスプールで並列に読む）"""
+        if len(changed) < PARALLEL_THRESHOLD:
+            for path, size, mtime_ns in changed:
+                yield read_image_header(self.root, path, size, mtime_ns)
+            return
+        paths, sizes, mtimes = zip(*changed)
+        with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+            yield from executor.map(read_image_header, [self.root] * len(paths), paths, sizes, mtimes,
+                                    chunksize=16)
+
+    def _store(self, record):
+        self.connection.execute(
+            "INSERT OR REPLACE INTO images VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (record.path, record.folder, record.size, record.mtime_ns, record.width, record.height,
+             record.mode, record.has_alpha, record.orientation, record.content_hash, record.bucket)
+        )
+
+    def query(self, folder='', recursive=False, supported_formats=None, exclude_folders=()):
+        """索引から画像を ImageRecord で返す（フォルダ順・名前順、ファイルシステムは見ない）
+
+        Args:
+            folder: ルートからの相対パス（'' はルート）
+            recursive: サブフォルダの画像も返す
+            supported_formats: 返す拡張子（None の場合はすべて）
+            exclude_folders: 返さないフォルダ（ルートからの相対パス、サブフォルダも除く）
+        """
+        if not recursive:
+            condition, params = "folder = ?", (folder,)
+        elif folder:
+            # folder 自身と folder/ 以下（'/' の次の文字は '0'）を索引で範囲検索する
+            condition, params = "(folder = ? OR (folder >= ? AND folder < ?))", (folder, folder + '/', folder + '0')
+        else:
+            condition, params = "1", ()
+
+        cursor = self.connection.execute(
+            f"SELECT * FROM images WHERE {condition} ORDER BY folder, path", params)
+        for row in cursor:
+            record = ImageRecord(*row)
+            if supported_formats is not None and \
+                    os.path.splitext(record.path)[1].lower() not in supported_formats:
+                continue
+            if any(record.folder == excluded or record.folder.startswith(excluded + '/')
+                   for excluded in exclude_folders):
+                continue
+            if record.has_alpha is not None:
+                record.has_alpha = bool(record.has_alpha)
+            yield record
@@ -0,0 +1,56 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image  # noqa: E402
+
+import batch_cli  # noqa: E402
+
+
+def _make_images(folder, count, color=(200, 50, 50)):
+    for i in range(count):
+        Image.new('RGB', (64, 48), color).save(os.path.join(folder, f"img{i}.png"))
+
+
+def _dry_run(capsys, *args):
+    capsys.readouterr()
+    assert batch_cli.main(['resize', *args, '--dry-run']) == 0
+    return capsys.readouterr().out.splitlines()
+
+
+def test_use_index_detects_inputs_changed_after_indexing(tmp_path, capsys):
+    """索引の後で書き換えられた入力は、--use-index でも処理対象になる"""
+    folder = str(tmp_path)
+    _make_images(folder, 2)
+    assert batch_cli.main(['resize', folder, '--workers', '1']) == 0
+    assert batch_cli.main(['index', folder]) == 0
+    assert _dry_run(capsys, folder, '--use-index') == []
+
+    # 別の内容に書き換え、更新日時も確実に変える
+    path = os.path.join(folder, "img0.png")
+    Image.new('RGB', (64, 48), (10, 220, 30)).save(path)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    planned = _dry_run(capsys, folder, '--use-index')
+    assert planned == _dry_run(capsys, folder)
+    assert len(planned) == 1 and planned[0].startswith(path)
+
+
+def test_dry_run_does_not_write_manifest(tmp_path, capsys):
+    """更新日時だけが変わった入力があっても、dry-run はマニフェストを書き換えない"""
+    folder = str(tmp_path)
+    _make_images(folder, 3)
+    assert batch_cli.main(['resize', folder, '--workers', '1']) == 0
+    manifest_path = os.path.join(folder, "resize", ".manifest.jsonl")
+    with open(manifest_path) as f:
+        before = f.read()
+
+    path = os.path.join(folder, "img2.png")
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert _dry_run(capsys, folder) == []
+    with open(manifest_path) as f:
+        assert f.read() == before
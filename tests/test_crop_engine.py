@@ -0,0 +1,79 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest  # noqa: E402
+from PIL import Image  # noqa: E402
+
+from crop_engine import OutputManifest, compose_crop_transform, render_crop, run_with_fingerprint  # noqa: E402
+
+
+def test_input_rewritten_during_processing_is_not_recorded(tmp_path):
+    """処理中に同じサイズで書き換えられた入力は、次回の実行でやり直しになる"""
+    input_folder = tmp_path / "in"
+    output_folder = tmp_path / "out"
+    input_folder.mkdir()
+    output_folder.mkdir()
+    input_path = str(input_folder / "img.png")
+    output_path = str(output_folder / "img.png")
+    with open(input_path, 'w') as f:
+        f.write("AAA")
+
+    def worker(path, out_path):
+        with open(path) as f:
+            content = f.read()
+        with open(out_path, 'w') as f:
+            f.write(content)
+        # 処理中に同じサイズの別の内容に書き換えられる
+        with open(path, 'w') as f:
+            f.write("BBB")
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        return 3
+
+    manifest = OutputManifest(str(input_folder), str(output_folder), "settings")
+    result, stat, content_hash = run_with_fingerprint(worker, input_path, output_path)
+    manifest.record(input_path, output_path, stat, content_hash)
+    manifest.close()
+
+    assert result == 3
+    with open(output_path) as f:
+        assert f.read() == "AAA"
+    manifest = OutputManifest(str(input_folder), str(output_folder), "settings")
+    assert not manifest.is_up_to_date(input_path, output_path)
+    manifest.close()
+
+
+def test_unchanged_input_is_up_to_date(tmp_path):
+    input_path = str(tmp_path / "img.png")
+    output_path = str(tmp_path / "out.png")
+    with open(input_path, 'w') as f:
+        f.write("AAA")
+
+    def worker(path, out_path):
+        with open(out_path, 'w') as f:
+            f.write("out")
+        return 3
+
+    manifest = OutputManifest(str(tmp_path), str(tmp_path), "settings")
+    _, stat, content_hash = run_with_fingerprint(worker, input_path, output_path)
+    manifest.record(input_path, output_path, stat, content_hash)
+    manifest.close()
+    manifest = OutputManifest(str(tmp_path), str(tmp_path), "settings")
+    assert manifest.is_up_to_date(input_path, output_path)
+    manifest.close()
+
+
+@pytest.mark.parametrize("free_rotation_angle", [0, 20])
+def test_render_crop_inside_uniform_image_has_no_border_fringe(free_rotation_angle):
+    """画像の内側を大きく縮小して切り取っても、端に背景色が混ざらない"""
+    source = Image.new('RGB', (3000, 3000), (200, 50, 50))
+    _, (width, height) = compose_crop_transform(source.size, False, free_rotation_angle, 0)
+    center_x, center_y = width // 2, height // 2
+    crop_box = (center_x - 1024, center_y - 1024, center_x + 1024, center_y + 1024)
+
+    result = render_crop(source, crop_box, False, free_rotation_angle, 0, (0, 0, 0, 0), (256, 256))
+
+    assert result.size == (256, 256)
+    assert result.getextrema() == ((200, 200), (50, 50), (50, 50), (255, 255))